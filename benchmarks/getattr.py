@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Attribute reads on nodes which have already been initialized
+
+import timeit
+import mandalka
+
+class Plain:
+    def __init__(self, x):
+        self.x = x
+
+    def get(self):
+        return self.x
+
+@mandalka.node
+class Node:
+    def __init__(self, x):
+        self.x = x
+
+    def get(self):
+        return self.x
+
+plain = Plain(1)
+node = Node(1)
+node.x
+
+def bench(name, stmt):
+    n = 1000000
+    t = min(timeit.repeat(stmt, number=n, repeat=5, globals=globals()))
+    print("%-24s %6.1f ns" % (name, t / n * 1e9))
+
+bench("plain.x", "plain.x")
+bench("node.x", "node.x")
+bench("plain.get()", "plain.get()")
+bench("node.get()", "node.get()")
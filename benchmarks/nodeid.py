@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Constructing nodes which already exist, with large arguments
+
+import time
+import tracemalloc
+import mandalka
+
+# Nodes are released after each benchmark, so that the hash can change
+@mandalka.node(gc=True)
+class Node:
+    def __init__(self, values):
+        pass
+
+def bench(name, values):
+    node = Node(values)
+    t = time.perf_counter()
+    for _ in range(5):
+        Node(values)
+    t = (time.perf_counter() - t) / 5
+    tracemalloc.start()
+    assert Node(values) is node
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("%-26s %8.1f ms %8.1f MB peak" % (name, t * 1e3, peak / 2**20))
+
+ints = list(range(1000000))
+names = ["file_%d.txt" % i for i in range(1000000)]
+
+def bench_all():
+    bench("10^6 ints", ints)
+    bench("10^6 file names", names)
+    bench("{file name: int}", dict(zip(names[:100000], ints)))
+
+print("default:")
+bench_all()
+
+try:
+    mandalka.config(hash="blake2b")
+    print("blake2b:")
+    bench_all()
+except TypeError:
+    pass
+
+try:
+    import numpy as np
+    array = np.zeros(10**8, dtype=np.uint8)
+    print("arrays:")
+    bench("10^8 bytes", array)
+    array.flags.writeable = False
+    bench("10^8 bytes, read-only", array)
+except ImportError:
+    pass
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Parsing arguments of constructors with different signatures
+
+import timeit
+import importlib
+import mandalka
+
+node_module = importlib.import_module("mandalka.node")
+
+class Positional:
+    def __init__(self, a, b=2):
+        pass
+
+class KeywordOnly:
+    def __init__(self, a, *, b, c=3):
+        pass
+
+class VarArgs:
+    def __init__(self, a, *b, c=3):
+        pass
+
+class Star:
+    def __init__(*_):
+        pass
+
+cases = [
+    ("positional", Positional, "parse(1)"),
+    ("positional", Positional, "parse(a=1, b=5)"),
+    ("keyword-only", KeywordOnly, "parse(1, b=2)"),
+    ("*args", VarArgs, "parse(1, 2, 3, c=4)"),
+    ("*_", Star, "parse(1)"),
+]
+
+for name, cls, stmt in cases:
+    parse = node_module.argument_parser(cls.__init__, name)
+    n = 200000
+    t = min(timeit.repeat(stmt, number=n, repeat=5,
+        globals={"parse": parse}))
+    print("%-14s %-20s %6.0f ns" % (name, stmt, t / n * 1e9))
+
+@mandalka.node
+class Fib:
+    def __init__(self, n):
+        pass
+
+Fib(1)
+n = 200000
+t = min(timeit.repeat("Fib(1)", number=n, repeat=5, globals=globals()))
+print("%-35s %6.0f ns" % ("Fib(1) (existing node)", t / n * 1e9))
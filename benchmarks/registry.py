@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Constructing nodes from many threads at once
+
+import sys
+import time
+import threading
+import mandalka
+
+@mandalka.node
+class Node:
+    def __init__(self, i):
+        pass
+
+existing = [Node(i) for i in range(1000)]
+
+def run(n_threads, f):
+    threads = [threading.Thread(target=f, args=(t,))
+        for t in range(n_threads)]
+    t = time.perf_counter()
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    return time.perf_counter() - t
+
+def hits(t):
+    for _ in range(20):
+        for i in range(1000):
+            Node(i)
+
+def misses(t):
+    for i in range(5000):
+        Node((t, i, time.perf_counter()))
+
+gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+print("GIL enabled:", gil)
+print("threads   hits/s (x1000)   misses/s (x1000)")
+for n_threads in (1, 2, 4, 8, 16, 32):
+    h = n_threads * 20000 / run(n_threads, hits)
+    m = n_threads * 5000 / run(n_threads, misses)
+    print("%7d %16.0f %18.0f" % (n_threads, h / 1000, m / 1000))
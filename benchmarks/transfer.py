@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Moving evaluated nodes with large arrays between processes
+
+import time
+import numpy as np
+import mandalka
+
+@mandalka.node
+class Big:
+    def __init__(self, mb, where):
+        self.values = np.ones(mb * 2**20 // 8)
+
+def bench(name, evaluate, mb):
+    t = time.perf_counter()
+    node = evaluate([Big(mb, name)])[0]
+    t = time.perf_counter() - t
+    assert node.values[-1] == 1.0
+    print("%-20s %5d MB %8.1f ms" % (name, mb, t * 1e3))
+
+workers = mandalka.Workers(local=1)
+for mb in [64, 256]:
+    bench("processes()", mandalka.processes, mb)
+    bench("Workers(local=1)", workers.evaluate, mb)
+workers.close()
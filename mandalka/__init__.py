@@ -32,8 +32,46 @@ from .node import (
     inputs,
     config,
     lazy,
+    stats,
 )
 
 from .threads import (
     threads,
 )
+
+from .aio import (
+    aevaluate,
+    agather,
+)
+
+from .cache import (
+    LRU,
+    Spill,
+)
+
+from .graph import (
+    evaluate_graph,
+    dump_graph,
+    load_graph,
+)
+
+from .processes import (
+    processes,
+)
+
+from .store import (
+    Store,
+)
+
+from .stream import (
+    stream,
+)
+
+from .trace import (
+    Trace,
+)
+
+from .workers import (
+    Workers,
+    serve,
+)
@@ -0,0 +1,105 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import threading
+
+from .node import (
+    params,
+    touch,
+    is_node,
+    describe,
+    state_lock,
+    call_init,
+    load_stored,
+    save_stored,
+    complete,
+    record_init,
+    global_config,
+    in_flight,
+    NEW,
+    RUNNING,
+    DONE,
+    FAILED,
+    SPILLED,
+)
+
+async def run_async_init(node, p):
+    success = False
+    start = global_config["stats"] and asyncio.get_running_loop().time()
+    try:
+        if not load_stored(node, p):
+            await call_init(node, p)
+            save_stored(node, p)
+        success = True
+    except BaseException as e:
+        p.error = e
+        raise
+    finally:
+        if start:
+            record_init(p.cls.stats,
+                asyncio.get_running_loop().time() - start, success)
+        with state_lock(p):
+            del in_flight[id(p)]
+        complete(node, p, success)
+
+async def aevaluate(node):
+    p = params.get(node)
+    if p.state == DONE:
+        return node
+
+    if not p.cls.is_async:
+        await asyncio.get_running_loop().run_in_executor(None, touch, node)
+        return node
+
+    # All coroutines waiting for the same node share one task
+    with state_lock(p):
+        task = in_flight.get(id(p))
+        if task is None and p.state == NEW:
+            p.state = RUNNING
+            p.owner = threading.get_ident()
+            task = asyncio.ensure_future(run_async_init(node, p))
+            in_flight[id(p)] = task
+
+    if task is not None:
+        await asyncio.shield(task)
+    elif p.state in (RUNNING, SPILLED):
+        # Some other thread is running __init__, or the node has
+        # to be loaded from disk
+        await asyncio.get_running_loop().run_in_executor(None, touch, node)
+
+    if p.state == FAILED:
+        raise RuntimeError(
+            describe(node) + ": failed to run __init__"
+        ) from p.error
+    return node
+
+async def agather(*args):
+    # Don't look up attributes of nodes, it would evaluate them here
+    if len(args) == 1 and not is_node(args[0]):
+        try:
+            args[0].__iter__
+            args = args[0]
+        except AttributeError:
+            pass
+
+    await asyncio.gather(*[aevaluate(o) for o in args])
+    return args
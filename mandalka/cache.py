@@ -0,0 +1,218 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import pickle
+import weakref
+import threading
+import collections
+
+from .node import (
+    params,
+    is_node,
+    set_class,
+    state_lock,
+    DONE,
+    SPILLED,
+)
+from .store import StatePickler, StateUnpickler
+
+def estimate_size(obj, seen=None):
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    # NumPy arrays include their data here, unless they are views
+    size = sys.getsizeof(obj)
+    if is_node(obj):
+        pass
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(o, seen) for o in obj)
+    elif isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen)
+            for k, v in obj.items())
+    elif isinstance(getattr(obj, "__dict__", None), dict):
+        if not isinstance(obj, type):
+            size += estimate_size(obj.__dict__, seen)
+    return size
+
+class LRU:
+    def __init__(self, *, max_bytes=None, max_count=None):
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.lock = threading.Lock()
+        self.nodes = collections.OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def add(self, node):
+        size = estimate_size(object.__getattribute__(node, "__dict__"))
+        with self.lock:
+            old = self.nodes.pop(id(node), None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self.nodes[id(node)] = (node, size)
+            self.total_bytes += size
+            evicted = self.evict()
+        # Nodes may be deleted here, outside of the lock
+        del evicted
+
+    def use(self, node):
+        with self.lock:
+            if id(node) in self.nodes:
+                self.nodes.move_to_end(id(node))
+                self.hits += 1
+
+    def evict(self):
+        evicted = []
+        while len(self.nodes) > 0 and (
+                (self.max_count is not None
+                    and len(self.nodes) > self.max_count)
+                or (self.max_bytes is not None
+                    and self.total_bytes > self.max_bytes)):
+            _, (node, size) = self.nodes.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            evicted.append(node)
+        return evicted
+
+    def sizes(self):
+        with self.lock:
+            return [(node, size) for node, size in self.nodes.values()]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "count": len(self.nodes),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
+
+class Spill:
+    def __init__(self, max_bytes, *, path=None):
+        self.max_bytes = max_bytes
+        self.path = path
+        self.lock = threading.Lock()
+        self.nodes = collections.OrderedDict()
+        self.spilled = {}
+        self.total_bytes = 0
+        self.spills = 0
+        self.spilled_bytes = 0
+        self.reloads = 0
+        self.reloaded_bytes = 0
+        self.failed = 0
+
+    def directory(self):
+        with self.lock:
+            if self.path is None:
+                # Files are only needed while this process is running
+                import atexit
+                import shutil
+                import tempfile
+                self.path = tempfile.mkdtemp(prefix="mandalka-spill-")
+                atexit.register(shutil.rmtree, self.path, True)
+            return self.path
+
+    def add(self, node):
+        size = estimate_size(object.__getattribute__(node, "__dict__"))
+        with self.lock:
+            old = self.nodes.pop(id(node), None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self.nodes[id(node)] = (weakref.ref(node), size)
+            self.total_bytes += size
+
+            # The node which was just added is about to be used
+            cold = []
+            while len(self.nodes) > 1 and self.total_bytes > self.max_bytes:
+                _, (ref, size) = self.nodes.popitem(last=False)
+                self.total_bytes -= size
+                if ref() is not None:
+                    cold.append((ref(), size))
+        for cold_node, size in cold:
+            self.spill(cold_node, size)
+
+    def use(self, node):
+        with self.lock:
+            if id(node) in self.nodes:
+                self.nodes.move_to_end(id(node))
+
+    def spill(self, node, size):
+        p = params.get(node)
+        state = object.__getattribute__(node, "__dict__")
+        path = os.path.join(self.directory(), p.nodeid + ".pkl")
+        try:
+            with open(path + ".tmp", "wb") as f:
+                StatePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(state)
+            os.replace(path + ".tmp", path)
+        except Exception:
+            # Nodes which can't be saved stay in memory
+            try:
+                os.remove(path + ".tmp")
+            except FileNotFoundError:
+                pass
+            with self.lock:
+                self.failed += 1
+            return
+
+        with state_lock(p):
+            if p.state != DONE:
+                return
+            with self.lock:
+                self.spilled[p.nodeid] = size
+                self.spills += 1
+                self.spilled_bytes += size
+            # From now on, attribute access will reload the state
+            set_class(node, p.cls.node)
+            p.state = SPILLED
+            object.__setattr__(node, "__dict__", {})
+
+    def load(self, node):
+        nodeid = params.get(node).nodeid
+        with self.lock:
+            size = self.spilled.pop(nodeid)
+        path = os.path.join(self.directory(), nodeid + ".pkl")
+        with open(path, "rb") as f:
+            state = StateUnpickler(f).load()
+        object.__getattribute__(node, "__dict__").update(state)
+        with self.lock:
+            self.reloads += 1
+            self.reloaded_bytes += size
+
+    def stats(self):
+        with self.lock:
+            return {
+                "count": len(self.nodes),
+                "bytes": self.total_bytes,
+                "spills": self.spills,
+                "spilled_bytes": self.spilled_bytes,
+                "reloads": self.reloads,
+                "reloaded_bytes": self.reloaded_bytes,
+                "failed": self.failed,
+            }
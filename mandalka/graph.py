@@ -0,0 +1,199 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import collections
+
+from .node import (
+    params,
+    touch,
+    inputs,
+    is_node,
+    unique_id,
+    is_initialized,
+    global_config,
+    registered_classes,
+)
+
+def evaluate_graph(roots, workers=None):
+    if is_node(roots):
+        roots = [roots]
+    if workers is None:
+        workers = global_config["threads"]
+    if int(workers) < 1:
+        raise ValueError("Number of workers must be positive")
+
+    # Find all nodes that need to be evaluated (nodes are compared by id,
+    # because hashing a node could run its __init__)
+    waiting_for = {}
+    users = {}
+    stack = [n for n in roots if not is_initialized(n)]
+    for n in stack:
+        waiting_for[id(n)] = None
+    ready = collections.deque()
+    while len(stack) > 0:
+        n = stack.pop()
+        deps = [i for i in inputs(n) if not is_initialized(i)]
+        waiting_for[id(n)] = len(deps)
+        if len(deps) == 0:
+            ready.append(n)
+        for d in deps:
+            users.setdefault(id(d), []).append(n)
+            if id(d) not in waiting_for:
+                waiting_for[id(d)] = None
+                stack.append(d)
+
+    cond = threading.Condition()
+    running = [0]
+    errors = []
+
+    def work():
+        while True:
+            with cond:
+                while len(ready) == 0 and running[0] > 0:
+                    cond.wait()
+                if len(ready) == 0:
+                    return
+                n = ready.popleft()
+                running[0] += 1
+            error = None
+            try:
+                touch(n)
+            except BaseException as e:
+                error = e
+            with cond:
+                running[0] -= 1
+                if error is None:
+                    # Nodes which depend on failed ones are never run
+                    for u in users.get(id(n), ()):
+                        waiting_for[id(u)] -= 1
+                        if waiting_for[id(u)] == 0:
+                            ready.append(u)
+                else:
+                    errors.append(error)
+                cond.notify_all()
+
+    threads = [
+        threading.Thread(target=work)
+        for _ in range(min(int(workers), len(waiting_for)) - 1)
+    ]
+    [t.start() for t in threads]
+    work()
+    [t.join() for t in threads]
+
+    if len(errors) > 0:
+        raise errors[0]
+    return roots
+
+class NodeRef:
+    __slots__ = ("index",)
+
+    def __init__(self, index):
+        self.index = index
+
+    def __eq__(self, other):
+        return isinstance(other, NodeRef) and self.index == other.index
+
+    def __hash__(self):
+        return hash(self.index)
+
+    def __repr__(self):
+        return "NodeRef(%d)" % self.index
+
+    def __reduce__(self):
+        return (NodeRef, (self.index,))
+
+def dump_graph(roots):
+    single = is_node(roots)
+    if single:
+        roots = [roots]
+
+    # List all nodes so that inputs come before their users
+    order = []
+    index = {}
+    stack = [(n, False) for n in reversed(roots)]
+    while len(stack) > 0:
+        n, expanded = stack.pop()
+        if id(n) in index:
+            continue
+        if expanded:
+            index[id(n)] = len(order)
+            order.append(n)
+            continue
+        stack.append((n, True))
+        for i in inputs(n):
+            if id(i) not in index:
+                stack.append((i, False))
+
+    def encode(obj):
+        if params.get(obj) is not None:
+            return NodeRef(index[id(obj)])
+        if isinstance(obj, tuple):
+            return tuple(encode(v) for v in obj)
+        if isinstance(obj, list):
+            return [encode(v) for v in obj]
+        if isinstance(obj, (set, frozenset)):
+            return set(encode(v) for v in obj)
+        if isinstance(obj, dict):
+            return {encode(k): encode(v) for k, v in obj.items()}
+        return obj
+
+    nodes = []
+    for n in order:
+        p = params.get(n)
+        nodes.append((p.cls.clsname, p.nodeid,
+            encode(p.args), encode(dict(p.kwargs))))
+
+    result = [index[id(n)] for n in roots]
+    return {
+        "nodes": nodes,
+        "roots": result[0] if single else result,
+    }
+
+def load_graph(data):
+    nodes = []
+
+    def decode(obj):
+        if isinstance(obj, NodeRef):
+            return nodes[obj.index]
+        if isinstance(obj, tuple):
+            return tuple(decode(v) for v in obj)
+        if isinstance(obj, list):
+            return [decode(v) for v in obj]
+        if isinstance(obj, (set, frozenset)):
+            return set(decode(v) for v in obj)
+        if isinstance(obj, dict):
+            return {decode(k): decode(v) for k, v in obj.items()}
+        return obj
+
+    for cls_name, nodeid, args, kwargs in data["nodes"]:
+        cls_params = registered_classes.get(cls_name)
+        if cls_params is None:
+            raise ValueError("Unknown node class: " + cls_name)
+        n = cls_params.node(*decode(args), **decode(kwargs))
+        if unique_id(n) != nodeid:
+            raise ValueError("<%s %s>: arguments don't match the node id"
+                % (cls_name, nodeid))
+        nodes.append(n)
+
+    if isinstance(data["roots"], list):
+        return [nodes[i] for i in data["roots"]]
+    return nodes[data["roots"]]
@@ -22,13 +22,10 @@
 import os
 import sys
 import inspect
+import time
 import hashlib
 import threading
 
-def str_hash(s):
-    h = hashlib.sha256(bytes("mandalka:" + s, "UTF-8"))
-    return h.digest()[0:8].hex()
-
 class ByInstanceStorage:
     def __init__(self):
         by_id = {}
@@ -52,23 +49,101 @@ class ByInstanceStorage:
         self.get = get
         self.add = add
 
+class ClassParams:
+    __slots__ = ("init", "clsname", "node", "evaluated", "store",
+        "copy_args", "cache", "spill", "stats", "is_async", "by_nodeid")
+
+class ClassStats:
+    __slots__ = ("lock", "constructions", "hits", "inits", "failed",
+        "init_time", "max_init_time", "wait_time")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.constructions = 0
+        self.hits = 0
+        self.inits = 0
+        self.failed = 0
+        self.init_time = 0.0
+        self.max_init_time = 0.0
+        self.wait_time = 0.0
+
+class NodeParams:
+    __slots__ = ("cls", "args", "kwargs", "nodeid", "state", "owner",
+        "waiting", "error", "prefetched")
+
+# States of nodes
+NEW, RUNNING, DONE, FAILED, SPILLED = range(5)
+
+# Evaluations of async nodes which are in progress
+in_flight = {}
+
 global_lock = threading.Lock()
 
+# Short critical sections for updating the state of nodes
+state_locks = [threading.Lock() for _ in range(64)]
+
+def state_lock(p):
+    return state_locks[(id(p) >> 4) % 64]
+
 params = ByInstanceStorage()
-registered_classes = set()
+registered_classes = {}
 
 global_config = {
-    "lazy": True
+    "lazy": True,
+    "cache_dir": ".mandalka",
+    "threads": min(32, (os.cpu_count() or 1) + 4),
+    "processes": os.cpu_count() or 1,
+    "hash": "sha256",
+    "stats": False,
+    "trace": None,
+    "recursive": True,
 }
 
-def config(*, lazy=None):
+def config(*, lazy=None, cache_dir=None, threads=None, processes=None,
+        hash=None, stats=None, trace=None, recursive=None):
     with global_lock:
         if lazy is not None:
-            global_config["lazy"] = bool(lazy)
+            if lazy == "prefetch":
+                global_config["lazy"] = "prefetch"
+            else:
+                global_config["lazy"] = bool(lazy)
+        if cache_dir is not None:
+            global_config["cache_dir"] = str(cache_dir)
+        if threads is not None:
+            if int(threads) < 1:
+                raise ValueError("Number of threads must be positive")
+            global_config["threads"] = int(threads)
+        if processes is not None:
+            if int(processes) < 1:
+                raise ValueError("Number of processes must be positive")
+            global_config["processes"] = int(processes)
+        if hash is not None:
+            HashWriter(hash)
+            # Existing nodes would be created again with other ids
+            if hash != global_config["hash"] and any(
+                    len(getattr(c, "by_nodeid", ())) > 0
+                    for c in registered_classes.values()):
+                raise ValueError("Cannot change the hash algorithm "
+                    "after nodes are created")
+            global_config["hash"] = hash
+        if stats is not None:
+            global_config["stats"] = bool(stats)
+        if trace is not None:
+            global_config["trace"] = trace or None
+        if recursive is not None:
+            global_config["recursive"] = bool(recursive)
 
 def safe_copy(obj):
-    if obj is None:
-        return None
+    if type(obj) in plain_types:
+        return obj
+
+    # Checked first, because isinstance() has to look up
+    # the __class__ attribute of nodes
+    if params.get(obj) is not None:
+        return obj
 
     if isinstance(obj, (int, bool, float, complex, str, bytes)):
         return obj
@@ -85,7 +160,8 @@ def safe_copy(obj):
     if isinstance(obj, dict):
         return {safe_copy(k): safe_copy(v) for k, v in obj.items()}
 
-    if params.get(obj) is not None:
+    # Arrays are read-only after freeze()
+    if is_array(obj):
         return obj
 
     if isinstance(obj, type):
@@ -93,82 +169,527 @@ def safe_copy(obj):
 
     raise ValueError("Invalid argument type: " + str(type(obj)))
 
-def describe(obj, depth=1):
-    depth = int(depth)
+plain_types = {type(None), int, bool, float, complex, str, bytes}
 
-    if obj is None:
-        return "None"
+def read_only(self, *args, **kwargs):
+    raise TypeError("Arguments of nodes cannot be modified")
+
+class FrozenList(list):
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    append = extend = insert = pop = remove = clear = read_only
+    sort = reverse = read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = read_only
+
+class FrozenDict(dict):
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    pop = popitem = clear = update = setdefault = read_only
+    __setitem__ = __delitem__ = __ior__ = read_only
+
+no_kwargs = FrozenDict()
+
+def freeze(obj):
+    if type(obj) in plain_types:
+        return obj
+
+    if params.get(obj) is not None:
+        return obj
 
     if isinstance(obj, (int, bool, float, complex, str, bytes)):
-        return repr(obj)
+        return obj
+
+    if isinstance(obj, (FrozenList, FrozenDict)):
+        return obj
 
     if isinstance(obj, tuple):
-        if len(obj) == 1:
-            return "(" + describe(obj[0], depth) + ",)"
-        else:
-            return "(" + ", ".join([describe(o, depth) for o in obj]) + ")"
+        frozen = tuple(freeze(v) for v in obj)
+        if all(a is b for a, b in zip(frozen, obj)):
+            return obj
+        return frozen
 
     if isinstance(obj, list):
-        return "[" + ", ".join([describe(o, depth) for o in obj]) + "]"
+        return FrozenList(freeze(v) for v in obj)
 
     if isinstance(obj, (set, frozenset)):
-        return "set(" + ", ".join(sorted(
-            describe(o, depth) for o in obj
-        )) + ")"
+        return frozenset(freeze(v) for v in obj)
 
     if isinstance(obj, dict):
-        return "{" + ", ".join(sorted(
-            describe(k, depth) + ": " + describe(v, depth)
-            for k, v in obj.items()
-        )) + "}"
+        return FrozenDict((freeze(k), freeze(v)) for k, v in obj.items())
+
+    if is_array(obj):
+        if obj.dtype.hasobject:
+            raise ValueError("Invalid argument type: " + str(type(obj)))
+        if is_immutable(obj):
+            return obj
+        frozen = obj.copy()
+        frozen.flags.writeable = False
+        return frozen
+
+    # Other buffers become bytes or read-only arrays, which can be
+    # pickled (see buffer_description)
+    view = buffer_view(obj)
+    if view is not None:
+        if is_byte_buffer(view):
+            return view.tobytes()
+        import numpy
+        frozen = numpy.array(view)
+        frozen.flags.writeable = False
+        return frozen
+
+    if isinstance(obj, type):
+        raise ValueError("Invalid argument: " + str(obj))
+
+    raise ValueError("Invalid argument type: " + str(type(obj)))
+
+def describe(obj, depth=1):
+    parts = []
+    write_description(obj, int(depth), parts.append)
+    return "".join(parts)
+
+def write_description(obj, depth, write):
+    if type(obj) in plain_types:
+        write(repr(obj))
+        return
+
+    p = params.get(obj)
+    if p is not None and depth == 0:
+        write("<" + p.cls.clsname + " " + p.nodeid + ">")
+        return
+
+    # Nested arguments are expanded from an explicit stack, so that
+    # deep graphs of nodes can be described with depth=-1
+    stack = [description_parts(obj, depth)]
+    while len(stack) > 0:
+        try:
+            part = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        if type(part) is str:
+            write(part)
+        else:
+            stack.append(description_parts(*part))
 
+def description_parts(obj, depth):
     p = params.get(obj)
     if p is not None:
         if depth == 0:
-            return "<" + p["clsname"] + " " + p["nodeid"] + ">"
+            yield "<" + p.cls.clsname + " " + p.nodeid + ">"
+        else:
+            yield p.cls.clsname + "("
+            for i, o in enumerate(p.args):
+                if i > 0:
+                    yield ", "
+                yield (o, depth-1)
+            for i, k in enumerate(sorted(p.kwargs)):
+                if i > 0 or len(p.args) > 0:
+                    yield ", "
+                yield k + "="
+                yield (p.kwargs[k], depth-1)
+            yield ")"
+        return
+
+    if obj is None:
+        yield "None"
+        return
+
+    if isinstance(obj, (int, bool, float, complex, str, bytes)):
+        yield repr(obj)
+        return
+
+    if isinstance(obj, (tuple, list)):
+        yield "(" if isinstance(obj, tuple) else "["
+        for i in range(0, len(obj), 1024):
+            if i > 0:
+                yield ", "
+            chunk = obj[i:i+1024]
+            if all(type(o) in plain_types for o in chunk):
+                yield ", ".join(map(repr, chunk))
+                continue
+            for j, o in enumerate(chunk):
+                if j > 0:
+                    yield ", "
+                yield (o, depth)
+        if isinstance(obj, tuple):
+            yield ",)" if len(obj) == 1 else ")"
         else:
-            args = [describe(o, depth-1) for o in p["args"]]
-            for k in sorted(p["kwargs"]):
-                args.append(k + "=" + describe(p["kwargs"][k], depth-1))
-            return p["clsname"] + "(" + ", ".join(args) + ")"
+            yield "]"
+        return
+
+    if isinstance(obj, (set, frozenset)):
+        yield "set(" + ", ".join(sorted(
+            describe(o, depth) for o in obj
+        )) + ")"
+        return
+
+    if isinstance(obj, dict):
+        # Sorting by key descriptions gives the same order as sorting
+        # full "key: value" strings, unless two keys look the same
+        items = sorted(
+            (((repr(k) if type(k) in plain_types else describe(k, depth))
+                + ": ", v) for k, v in obj.items()),
+            key=lambda kv: kv[0]
+        )
+        if any(a[0] == b[0] for a, b in zip(items, items[1:])):
+            yield "{" + ", ".join(sorted(
+                k + describe(v, depth) for k, v in items
+            )) + "}"
+            return
+        yield "{"
+        for i, (k, v) in enumerate(items):
+            if i > 0:
+                k = ", " + k
+            if type(v) in plain_types:
+                yield k + repr(v)
+            else:
+                yield k
+                yield (v, depth)
+        yield "}"
+        return
+
+    description = buffer_description(obj)
+    if description is not None:
+        yield description
+        return
 
     if isinstance(obj, type):
         raise ValueError("Invalid argument: " + str(obj))
 
     raise ValueError("Invalid argument type: " + str(type(obj)))
 
+# Digests of read-only arrays, which are assumed to never change
+buffer_digests = {}
+
+def is_array(obj):
+    # Don't import numpy if it isn't used anyway
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(obj, numpy.ndarray)
+
+def is_immutable(array):
+    # Read-only views of writable arrays can still change
+    obj = array
+    while is_array(obj):
+        if obj.flags.writeable:
+            return False
+        obj = obj.base
+    if obj is None:
+        return True
+    try:
+        return memoryview(obj).readonly
+    except TypeError:
+        return False
+
+def buffer_description(obj):
+    if is_array(obj):
+        import numpy
+        if obj.dtype.hasobject:
+            return None
+        read_only = is_immutable(obj)
+        if read_only:
+            cached = buffer_digests.get(id(obj))
+            if cached is not None and cached[0]() is obj:
+                return cached[1]
+        # Raw bytes in C order (arrays with other layouts are copied)
+        data = numpy.ascontiguousarray(obj).reshape(-1).view(numpy.uint8)
+        description = "ndarray(%s, %r, %s)" % (obj.dtype, obj.shape,
+            hashlib.sha256(data).hexdigest()[0:16])
+        if read_only:
+            import weakref
+            key = id(obj)
+            buffer_digests[key] = (weakref.ref(obj,
+                lambda _: buffer_digests.pop(key, None)), description)
+        return description
+
+    view = buffer_view(obj)
+    if view is None:
+        return None
+    if is_byte_buffer(view):
+        return repr(view.tobytes())
+    if "numpy" not in sys.modules:
+        try:
+            import numpy
+        except ImportError:
+            return None
+    return buffer_description(sys.modules["numpy"].asarray(view))
+
+def buffer_view(obj):
+    if isinstance(obj, (str, bytes)):
+        return None
+    # NumPy scalars are not accepted as 0-d buffers
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(obj, numpy.generic):
+        return None
+    try:
+        return memoryview(obj)
+    except TypeError:
+        return None
+
+def is_byte_buffer(view):
+    # Described and frozen the same way as bytes
+    return view.ndim == 1 and view.format in ("B", "c")
+
+class HashWriter:
+    def __init__(self, algorithm):
+        if algorithm == "sha256":
+            self.hash = hashlib.sha256()
+        elif algorithm == "blake2b":
+            self.hash = hashlib.blake2b(digest_size=8)
+        else:
+            raise ValueError("Unknown hash algorithm: " + str(algorithm))
+        self.parts = []
+        self.size = 0
+
+    def write(self, s):
+        self.parts.append(s)
+        self.size += len(s)
+        if self.size >= 65536:
+            self.flush()
+
+    def flush(self):
+        self.hash.update(bytes("".join(self.parts), "UTF-8"))
+        self.parts = []
+        self.size = 0
+
+    def hexdigest(self):
+        self.flush()
+        return self.hash.digest()[0:8].hex()
+
+set_class = object.__dict__["__class__"].__set__
+
 def touch(node):
     p = params.get(node)
-    with p["lock"]:
-        if ("error" in p) and p["error"]:
-            raise RuntimeError(
-                describe(node) + ": failed to run __init__"
-            )
-        if "initialized" not in p:
-            p["initialized"] = True
-            args = safe_copy(p["args"])
-            kwargs = safe_copy(p["kwargs"])
-            p["error"] = False
-            try:
-                p["init"](node, *args, **kwargs)
-                p["error"] = True
-            finally:
-                p["error"] = not p["error"]
+    if p.state == NEW and not global_config["recursive"]:
+        touch_inputs(node)
+    return touch_one(node, p)
+
+def touch_one(node, p):
+    if p.cls.is_async and p.state != DONE and in_event_loop():
+        # Only the task running __init__ may see a partial state
+        import asyncio
+        task = in_flight.get(id(p))
+        if p.state == NEW or (task is not None
+                and task is not asyncio.current_task()):
+            raise RuntimeError(describe(node) + ": use "
+                "'await mandalka.aevaluate()' inside an event loop")
+    return initialize(node, run_init)
+
+def touch_inputs(node):
+    # Evaluate all inputs bottom-up, so that __init__ of every node
+    # finds its arguments already evaluated
+    seen = {id(node)}
+    stack = [(node, False)]
+    while len(stack) > 0:
+        obj, expanded = stack.pop()
+        p = params.get(obj)
+        if expanded:
+            if obj is not node:
+                touch_one(obj, p)
+            continue
+        stack.append((obj, True))
+        if p.state != NEW:
+            continue
+        try:
+            obj_inputs = inputs(obj)
+        except ValueError:
+            continue
+        for i in obj_inputs:
+            if id(i) not in seen and params.get(i).state == NEW:
+                seen.add(id(i))
+                stack.append((i, False))
+
+def prefetch(node):
+    # Start evaluating in the background, without waiting for it
+    # (nodes constructed again are not submitted again)
+    p = params.get(node)
+    with state_lock(p):
+        if p.state != NEW or p.prefetched:
+            return
+        p.prefetched = True
+    from .threads import pool
+    pool.submit(touch, node)
+
+def in_event_loop():
+    import asyncio
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def initialize(node, run):
+    p = params.get(node)
+    if p.state == DONE:
+        return node
+
+    run_here = False
+    reload = False
+    waiting = None
+    with state_lock(p):
+        if p.state == NEW:
+            p.state = RUNNING
+            p.owner = threading.get_ident()
+            run_here = True
+        elif p.state == SPILLED:
+            p.state = RUNNING
+            p.owner = threading.get_ident()
+            reload = True
+        elif p.state == RUNNING and p.owner != threading.get_ident():
+            # Only allocate an event if other threads have to wait
+            if p.waiting is None:
+                p.waiting = threading.Event()
+            waiting = p.waiting
+
+    if run_here:
+        finish(node, p, run)
+    elif reload:
+        reload_spilled(node, p)
+    elif waiting is not None:
+        trace = global_config["trace"]
+        if trace is not None:
+            trace.begin("wait", p)
+        if global_config["stats"]:
+            start = time.perf_counter()
+            waiting.wait()
+            with p.cls.stats.lock:
+                p.cls.stats.wait_time += time.perf_counter() - start
+        else:
+            waiting.wait()
+        if trace is not None:
+            trace.end("wait", p)
+
+    if p.state == FAILED:
+        raise RuntimeError(
+            describe(node) + ": failed to run __init__"
+        ) from p.error
     return node
 
+def finish(node, p, run):
+    success = False
+    start = time.perf_counter() if global_config["stats"] else None
+    trace = global_config["trace"]
+    if trace is not None:
+        trace.begin("init", p)
+    try:
+        run(node, p)
+        success = True
+    except BaseException as e:
+        # Kept for threads which didn't run __init__ themselves
+        p.error = e
+        raise
+    finally:
+        if trace is not None:
+            trace.end("init", p)
+        if start is not None:
+            record_init(p.cls.stats, time.perf_counter() - start, success)
+        complete(node, p, success)
+
+def reload_spilled(node, p):
+    # Not counted as an init, because __init__ already ran
+    success = False
+    try:
+        p.cls.spill.load(node)
+        success = True
+    except BaseException as e:
+        p.error = e
+        raise
+    finally:
+        complete(node, p, success)
+
+def complete(node, p, success):
+    error = None
+    with state_lock(p):
+        if success:
+            # From now on, attribute access doesn't need to be checked
+            try:
+                set_class(node, p.cls.evaluated)
+            except BaseException as e:
+                success = False
+                error = p.error = e
+        p.state = DONE if success else FAILED
+        p.owner = None
+        waiting, p.waiting = p.waiting, None
+    if waiting is not None:
+        waiting.set()
+    if error is not None:
+        raise error
+    if success and p.cls.cache is not None:
+        p.cls.cache.add(node)
+    if success and p.cls.spill is not None:
+        p.cls.spill.add(node)
+
+def record_init(stats, duration, success):
+    with stats.lock:
+        stats.inits += 1
+        if not success:
+            stats.failed += 1
+        stats.init_time += duration
+        stats.max_init_time = max(stats.max_init_time, duration)
+
+def is_initialized(node):
+    return params.get(node).state != NEW
+
+def run_init(node, p):
+    if load_stored(node, p):
+        return
+
+    if p.cls.store is None:
+        run_new(node, p)
+        return
+
+    # Other processes wait for this one, and then load the result
+    with p.cls.store.lock(p.nodeid):
+        if not load_stored(node, p):
+            run_new(node, p)
+            save_stored(node, p)
+
+def run_new(node, p):
+    result = call_init(node, p)
+    if p.cls.is_async:
+        import asyncio
+        asyncio.run(result)
+
+def call_init(node, p):
+    if p.cls.copy_args:
+        return p.cls.init(node, *safe_copy(p.args), **safe_copy(p.kwargs))
+    else:
+        return p.cls.init(node, *p.args, **p.kwargs)
+
+def load_stored(node, p):
+    if p.cls.store is None:
+        return False
+    state = p.cls.store.load(p.nodeid)
+    if state is None:
+        return False
+    object.__getattribute__(node, "__dict__").update(state)
+    return True
+
+def save_stored(node, p):
+    if p.cls.store is not None:
+        p.cls.store.save(p.nodeid, object.__getattribute__(node, "__dict__"))
+
 def evaluate(node):
     try:
         touch(node)
     finally:
         p = params.get(node)
-        with p["lock"]:
-            del p["args"]
-            del p["kwargs"]
+        p.args = None
+        p.kwargs = None
 
 def lazy(f):
     f.is_lazy = True
     return f
 
+# Special attributes of classes which are not methods
+class_data = {"__dict__", "__weakref__", "__slots__", "__module__",
+    "__doc__", "__qualname__"}
+
 def wrap(f):
     def wrapped_f(self, *args, **kwargs):
         touch(self)
@@ -188,12 +709,12 @@ def argument_parser(method, method_name):
     if spec.defaults is None:
         start_of_defaults = len(arg_names)
     else:
-        defaults = safe_copy(spec.defaults)
+        defaults = freeze(spec.defaults)
         start_of_defaults = len(arg_names) - len(defaults)
 
     kw_defaults = {}
     if spec.kwonlydefaults is not None:
-        kw_defaults = safe_copy(spec.kwonlydefaults)
+        kw_defaults = freeze(spec.kwonlydefaults)
 
     def parse(*args, **kwargs):
         args = list(args)
@@ -239,13 +760,83 @@ def argument_parser(method, method_name):
                 raise TypeError("%s: missing argument '%s'"
                     % (method_name, name))
 
-        return safe_copy(args), safe_copy(kwargs)
+        return args, kwargs
+
+    # Let Python match arguments, and use the general parser above
+    # only to report errors
+    try:
+        fast_parse = compile_parser(spec, arg_names, defaults if
+            spec.defaults is not None else (), kw_defaults)
+    except SyntaxError:
+        return parse
+
+    def parse_fast(*args, **kwargs):
+        try:
+            return fast_parse(*args, **kwargs)
+        except TypeError:
+            return parse(*args, **kwargs)
+
+    return parse_fast
+
+def compile_parser(spec, arg_names, defaults, kw_defaults):
+    env = {}
+    signature = []
+    start_of_defaults = len(arg_names) - len(defaults)
+    for i, name in enumerate(arg_names):
+        if i >= start_of_defaults:
+            env["_d%d" % i] = defaults[i - start_of_defaults]
+            signature.append("%s=_d%d" % (name, i))
+        else:
+            signature.append(name)
+
+    if spec.varargs is not None:
+        signature.append("*" + spec.varargs)
+    elif len(spec.kwonlyargs) > 0:
+        signature.append("*")
+
+    for i, name in enumerate(spec.kwonlyargs):
+        if name in kw_defaults:
+            env["_k%d" % i] = kw_defaults[name]
+            signature.append("%s=_k%d" % (name, i))
+        else:
+            signature.append(name)
 
-    return parse
+    if spec.varkw is not None:
+        signature.append("**" + spec.varkw)
 
-def node(cls=None, *, gc=False):
+    if spec.varargs is None:
+        # Treat all arguments as named
+        result_args = "[]"
+        named = arg_names + spec.kwonlyargs
+    else:
+        result_args = "[" + ", ".join(arg_names + ["*" + spec.varargs]) + "]"
+        named = spec.kwonlyargs
+    result_kwargs = ["%r: %s" % (name, name) for name in named]
+    if spec.varkw is not None:
+        result_kwargs.append("**" + spec.varkw)
+
+    exec("def parse(" + ", ".join(signature) + "):\n"
+        + "    return " + result_args + ", {"
+        + ", ".join(result_kwargs) + "}\n", env)
+    return env["parse"]
+
+def node(cls=None, *, gc=False, store=None, copy_args=True, cache=None,
+        version=None, spill=None):
     if cls is None:
-        return lambda cls: node(cls, gc=gc)
+        return lambda cls: node(cls, gc=gc, store=store,
+            copy_args=copy_args, cache=cache, version=version, spill=spill)
+
+    # Nodes of different versions of a class get different ids
+    # (version=True means a hash of the source code of the class)
+    if version is True:
+        try:
+            source = inspect.getsource(cls)
+        except (OSError, TypeError):
+            raise ValueError("Cannot read the source code of "
+                + str(cls.__name__))
+        version = hashlib.sha256(bytes(source, "UTF-8")).hexdigest()[0:16]
+    if version is not None:
+        version = "@" + describe(version)
 
     # Warn if class names are not unique
     with global_lock:
@@ -257,15 +848,29 @@ def node(cls=None, *, gc=False):
             while cls_name + "_" + str(i) in registered_classes:
                 i += 1
             cls_name = cls_name + "_" + str(i)
-        registered_classes.add(cls_name)
+        cls_params = ClassParams()
+        cls_params.stats = ClassStats()
+        registered_classes[cls_name] = cls_params
 
     # Use weak references if user requests garbage collection
-    if gc:
+    # (a cache keeps only some of the nodes alive)
+    if gc or cache is not None:
         import weakref
         node_obj_by_nodeid = weakref.WeakValueDictionary()
     else:
         node_obj_by_nodeid = {}
 
+    # Lookups don't need locking, but creating new nodes does
+    registry_locks = [threading.Lock() for _ in range(16)]
+
+    # Save the results of __init__ on disk if requested
+    if store is not None:
+        from .store import Store
+        if store is True:
+            store = Store()
+        elif not isinstance(store, Store):
+            store = Store(store)
+
     class Node(cls):
         pass
 
@@ -273,22 +878,54 @@ def node(cls=None, *, gc=False):
     init = cls.__init__
     arg_parse = argument_parser(init, cls_name + ".__init__()")
 
+    # Parameters shared by all instances of this class
+    cls_params.init = init
+    cls_params.clsname = cls_name
+    cls_params.store = store
+    cls_params.copy_args = bool(copy_args)
+    cls_params.cache = cache
+    cls_params.spill = spill
+    cls_params.by_nodeid = node_obj_by_nodeid
+    cls_params.is_async = inspect.iscoroutinefunction(init)
+
     def node_new(node_cls, *args, **kwargs):
+        if node_cls == EvaluatedNode:
+            node_cls = Node
         if node_cls != Node:
             raise ValueError("Do not inherit from mandalka nodes")
 
-        # Standarize argument names etc.
+        # Standarize argument names etc. (arguments are validated
+        # while hashing, and only copied if the node is new)
         args, kwargs = arg_parse(*args, **kwargs)
 
-        # Build a full description of this constructor call
-        nodeid = repr(cls_name)
+        # Hash a full description of this constructor call
+        h = HashWriter(global_config["hash"])
+        h.write("mandalka:" + repr(cls_name))
+        if version is not None:
+            h.write(version)
         for a in args:
-            nodeid += "|" + describe(a, 0)
+            h.write("|")
+            write_description(a, 0, h.write)
         for k in sorted(kwargs):
-            nodeid += "|" + k + "=" + describe(kwargs[k], 0)
-        nodeid = str_hash(nodeid)
+            h.write("|" + k + "=")
+            write_description(kwargs[k], 0, h.write)
+        nodeid = h.hexdigest()
+
+        # Most of the time the node already exists
+        node = node_obj_by_nodeid.get(nodeid)
+        if global_config["stats"]:
+            with cls_params.stats.lock:
+                cls_params.stats.constructions += 1
+                if node is not None:
+                    cls_params.stats.hits += 1
+        if node is not None:
+            if cache is not None:
+                cache.use(node)
+            if spill is not None:
+                spill.use(node)
+            return node
 
-        with global_lock:
+        with registry_locks[int(nodeid[0], 16)]:
             # Make sure the object is unique
             try:
                 return node_obj_by_nodeid[nodeid]
@@ -300,19 +937,22 @@ def node(cls=None, *, gc=False):
             node_obj_by_nodeid[nodeid] = node
 
             # Store arguments to run cls.__init__() later
-            p = {}
-            p["init"] = init
-            p["clsname"] = cls_name
-            p["args"] = args
-            p["kwargs"] = kwargs
-            p["nodeid"] = nodeid
-            p["lock"] = threading.RLock()
+            p = NodeParams()
+            p.cls = cls_params
+            p.args = freeze(tuple(args))
+            p.kwargs = freeze(kwargs) if len(kwargs) > 0 else no_kwargs
+            p.nodeid = nodeid
+            p.state = NEW
+            p.owner = None
+            p.waiting = None
+            p.error = None
+            p.prefetched = False
 
             params.add(node, p)
             return node
 
     def node_to_str(self):
-        return "<" + cls_name + " " + params.get(self)["nodeid"] + ">"
+        return "<" + cls_name + " " + params.get(self).nodeid + ">"
 
     def node_getattr(self, name):
         if name == "__class__":
@@ -329,6 +969,8 @@ def node(cls=None, *, gc=False):
     def node_init(self, *args, **kwargs):
         if not global_config["lazy"]:
             touch(self)
+        elif global_config["lazy"] == "prefetch":
+            prefetch(self)
 
     def node_del(self):
         params.add(self, None)
@@ -343,48 +985,82 @@ def node(cls=None, *, gc=False):
     Node.__setattr__ = wrap(object.__setattr__)
     Node.__str__ = node_to_str
 
+    wrapped = {}
     for tpe in cls.__mro__:
         if tpe == object:
             continue
         for name, value in tpe.__dict__.items():
             if not name.startswith("__"):
                 continue
-            if name in ("__dict__", "__weakref__"):
+            if name in class_data:
                 continue
             if name in Node.__dict__:
                 continue
+            wrapped[name] = value
             setattr(Node, name, wrap(value))
 
+    # Same as Node, but without any checks (used after __init__)
+    EvaluatedNode = type(cls_name, (Node,), dict(wrapped,
+        __class__=property(lambda self: Node),
+        __getattribute__=object.__getattribute__,
+        __setattr__=object.__setattr__,
+    ))
+    EvaluatedNode.__qualname__ = cls_name
+
+    cls_params.node = Node
+    cls_params.evaluated = EvaluatedNode
+
     return Node
 
 def is_node(node):
     return params.get(node) is not None
 
 def unique_id(node):
-    return params.get(node)["nodeid"]
+    return params.get(node).nodeid
 
 def arguments(node):
     p = params.get(node)
-    if not "args" in p:
+    if p.args is None:
         raise ValueError("Cannot access arguments after evaluate()")
-    all_args = safe_copy(p["kwargs"])
-    for i, value in enumerate(safe_copy(p["args"])):
+    all_args = dict(p.kwargs)
+    for i, value in enumerate(p.args):
         all_args[i] = value
     return all_args
 
 def inputs(node):
     result = set()
     def visit(obj):
-        if isinstance(obj, (tuple, list, set, frozenset)):
+        if params.get(obj) is not None:
+            result.add(obj)
+        elif isinstance(obj, (tuple, list, set, frozenset)):
             [visit(o) for o in obj]
-        if isinstance(obj, dict):
+        elif isinstance(obj, dict):
             [visit(o) for o in obj.keys()]
             [visit(o) for o in obj.values()]
-        if params.get(obj) is not None:
-            result.add(obj)
     p = params.get(node)
-    if not "args" in p:
+    if p.args is None:
         raise ValueError("Cannot access inputs after evaluate()")
-    [visit(o) for o in p["args"]]
-    [visit(o) for o in p["kwargs"].values()]
+    [visit(o) for o in p.args]
+    [visit(o) for o in p.kwargs.values()]
+    return result
+
+def stats(reset=False):
+    result = {}
+    with global_lock:
+        classes = list(registered_classes.items())
+    for cls_name, cls_params in classes:
+        s = cls_params.stats
+        with s.lock:
+            result[cls_name] = {
+                "constructions": s.constructions,
+                "hits": s.hits,
+                "inits": s.inits,
+                "failed": s.failed,
+                "init_time": s.init_time,
+                "mean_init_time": s.init_time / max(1, s.inits),
+                "max_init_time": s.max_init_time,
+                "wait_time": s.wait_time,
+            }
+            if reset:
+                s.reset()
     return result
@@ -0,0 +1,111 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pickle
+import multiprocessing
+
+from .node import (
+    touch,
+    is_node,
+    run_init,
+    initialize,
+    is_initialized,
+    global_config,
+)
+from .store import dump_state, load_state
+
+# Nodes to evaluate, inherited by worker processes through fork()
+forked_nodes = []
+
+def evaluate_in_child(i):
+    node = forked_nodes[i]
+    try:
+        touch(node)
+    except BaseException as e:
+        try:
+            return i, False, pickle.dumps(e, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return i, False, pickle.dumps(RuntimeError(repr(e)))
+    try:
+        state = object.__getattribute__(node, "__dict__")
+        return i, True, dump_state(state)
+    except Exception:
+        # The parent process will run __init__ itself
+        return i, None, None
+
+def processes(*args):
+    # Don't look up attributes of nodes, it would evaluate them here
+    if len(args) == 1 and not is_node(args[0]):
+        try:
+            args[0].__iter__
+            args = args[0]
+        except AttributeError:
+            pass
+
+    todo = [o for o in args if not is_initialized(o)]
+    if len(todo) < 1:
+        return args
+
+    # Only fork() can share unevaluated nodes with child processes
+    ctx = multiprocessing.get_context("fork")
+
+    forked_nodes[:] = todo
+    try:
+        n_proc = min(global_config["processes"], len(todo))
+        with ctx.Pool(n_proc) as pool:
+            results = list(pool.imap_unordered(
+                evaluate_in_child,
+                range(len(todo)),
+            ))
+    finally:
+        forked_nodes[:] = []
+
+    first_error = None
+    for i, ok, data in sorted(results, key=lambda r: r[0]):
+        value = None
+        if ok:
+            try:
+                value = load_state(*data)
+            except Exception:
+                ok = None
+        elif ok is not None:
+            try:
+                value = pickle.loads(data)
+            except BaseException as e:
+                value = e
+
+        def install(node, p):
+            if ok is None:
+                # Nodes whose state can't be transferred are evaluated here
+                run_init(node, p)
+            elif not ok:
+                raise value
+            else:
+                object.__getattribute__(node, "__dict__").update(value)
+
+        try:
+            initialize(todo[i], install)
+        except BaseException as e:
+            if first_error is None:
+                first_error = e
+    if first_error is not None:
+        raise first_error
+    return args
@@ -0,0 +1,259 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import os
+import sys
+import mmap
+import pickle
+import shutil
+import tempfile
+import contextlib
+
+from .node import params, global_config, registered_classes
+from .graph import dump_graph, load_graph
+
+# Buffers smaller than this are pickled together with other data
+min_shared_size = 65536
+
+class StatePickler(pickle.Pickler):
+    # Nodes are saved by their arguments, not by their attributes
+    def persistent_id(self, obj):
+        p = params.get(obj)
+        if p is None:
+            return None
+        try:
+            return ("node", dump_graph(obj))
+        except ValueError:
+            # Arguments of nodes passed to evaluate() are not kept
+            return ("nodeid", (p.cls.clsname, p.nodeid))
+
+class StateUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, data = pid
+        if kind == "node":
+            return load_graph(data)
+        if kind == "nodeid":
+            cls_name, nodeid = data
+            cls_params = registered_classes.get(cls_name)
+            node = None
+            if cls_params is not None:
+                node = cls_params.by_nodeid.get(nodeid)
+            if node is None:
+                raise pickle.UnpicklingError("<%s %s>: node doesn't exist "
+                    "in this process" % (cls_name, nodeid))
+            return node
+        raise pickle.UnpicklingError("Unknown reference: " + repr(kind))
+
+def pickle_state(state, buffer_callback=None):
+    f = io.BytesIO()
+    StatePickler(f, protocol=5, buffer_callback=buffer_callback).dump(state)
+    return f.getvalue()
+
+def unpickle_state(data, buffers=None):
+    return StateUnpickler(io.BytesIO(data), buffers=buffers).load()
+
+def dump_buffers(state):
+    # Large buffers (like NumPy arrays) are returned separately,
+    # without copying them into the pickle
+    buffers = []
+
+    def keep_buffer(buf):
+        try:
+            raw = buf.raw()
+        except BufferError:
+            return True
+        if raw.nbytes < min_shared_size:
+            return True
+        buffers.append(raw)
+        return False
+
+    data = pickle_state(state, buffer_callback=keep_buffer)
+    return data, buffers
+
+def dump_state(state):
+    data, buffers = dump_buffers(state)
+
+    # Files in /dev/shm are only kept in memory
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    files = []
+    try:
+        for raw in buffers:
+            fd, path = tempfile.mkstemp(prefix="mandalka-", dir=directory)
+            files.append(path)
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+    except BaseException:
+        remove_files(files)
+        raise
+    return data, files
+
+def load_state(data, files):
+    # Arrays are mapped into memory instead of being read
+    buffers = []
+    try:
+        for path in files:
+            with open(path, "rb") as f:
+                buffers.append(mmap.mmap(f.fileno(), 0,
+                    access=mmap.ACCESS_COPY))
+    finally:
+        remove_files(files)
+    return unpickle_state(data, buffers=buffers)
+
+def remove_files(files):
+    for path in files:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+class PickleSerializer:
+    name = "pickle"
+    extension = ".pkl"
+
+    def accepts(self, value):
+        return True
+
+    def save(self, value, path):
+        with open(path, "wb") as f:
+            StatePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+
+    def load(self, path):
+        with open(path, "rb") as f:
+            return StateUnpickler(f).load()
+
+class NumpySerializer:
+    name = "numpy"
+    extension = ".npy"
+
+    def __init__(self, mmap_mode=None):
+        self.mmap_mode = mmap_mode
+
+    def accepts(self, value):
+        # Don't import numpy if the user doesn't use it
+        numpy = sys.modules.get("numpy")
+        if numpy is None:
+            return False
+        return (isinstance(value, numpy.ndarray)
+            and not value.dtype.hasobject)
+
+    def save(self, value, path):
+        import numpy
+        with open(path, "wb") as f:
+            numpy.save(f, value, allow_pickle=False)
+
+    def load(self, path):
+        import numpy
+        return numpy.load(path, mmap_mode=self.mmap_mode,
+            allow_pickle=False)
+
+class Store:
+    def __init__(self, path=None, *, mmap=False, serializers=None):
+        if serializers is None:
+            serializers = [
+                NumpySerializer("r" if mmap else None),
+                PickleSerializer(),
+            ]
+        self.path = path
+        self.serializers = list(serializers)
+
+    def directory(self):
+        if self.path is None:
+            return global_config["cache_dir"]
+        return self.path
+
+    @contextlib.contextmanager
+    def lock(self, nodeid):
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+
+        directory = self.directory()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, nodeid + ".lock")
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # The file may have been removed while we were waiting
+            try:
+                if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+        try:
+            yield
+        finally:
+            os.remove(path)
+            os.close(fd)
+
+    def load(self, nodeid):
+        path = os.path.join(self.directory(), nodeid)
+        try:
+            with open(os.path.join(path, "index.pkl"), "rb") as f:
+                index = pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+        by_name = {s.name: s for s in self.serializers}
+        state = {}
+        for name, serializer, file_name in index:
+            if serializer not in by_name:
+                raise ValueError("Unknown serializer '%s' in %s"
+                    % (serializer, path))
+            state[name] = by_name[serializer].load(
+                os.path.join(path, file_name)
+            )
+        return state
+
+    def save(self, nodeid, state):
+        directory = self.directory()
+        os.makedirs(directory, exist_ok=True)
+
+        # Write everything to a temporary directory first
+        tmp = tempfile.mkdtemp(prefix=".tmp-" + nodeid, dir=directory)
+        try:
+            index = []
+            for i, (name, value) in enumerate(state.items()):
+                for s in self.serializers:
+                    if s.accepts(value):
+                        break
+                else:
+                    raise ValueError("Cannot serialize attribute '%s'"
+                        % name)
+                file_name = str(i) + s.extension
+                s.save(value, os.path.join(tmp, file_name))
+                index.append((name, s.name, file_name))
+
+            with open(os.path.join(tmp, "index.pkl"), "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # Atomic, unless someone else has already saved this node
+            try:
+                os.rename(tmp, os.path.join(directory, nodeid))
+            except OSError:
+                if not os.path.isdir(os.path.join(directory, nodeid)):
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
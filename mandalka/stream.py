@@ -0,0 +1,86 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import pickle
+import tempfile
+
+from .node import unique_id
+
+def stream(f=None, *, spool=None):
+    if f is None:
+        return lambda f: stream(f, spool=spool)
+
+    # Chunks can be saved on disk, to replay them later
+    if spool is not None:
+        from .store import Store
+        if spool is True:
+            spool = Store()
+        elif not isinstance(spool, Store):
+            spool = Store(spool)
+
+    def chunks(self, *args, **kwargs):
+        if spool is None:
+            yield from f(self, *args, **kwargs)
+            return
+
+        if len(args) > 0 or len(kwargs) > 0:
+            raise TypeError("%s: spooled streams don't accept arguments"
+                % f.__name__)
+
+        path = os.path.join(spool.directory(),
+            unique_id(self) + "." + f.__name__ + ".stream")
+        try:
+            replay = open(path, "rb")
+        except FileNotFoundError:
+            replay = None
+
+        if replay is None:
+            yield from save_chunks(f(self), path)
+        else:
+            with replay:
+                while True:
+                    try:
+                        yield pickle.load(replay)
+                    except EOFError:
+                        return
+
+    # Replaying doesn't need to run __init__
+    chunks.is_lazy = True
+    chunks.__name__ = f.__name__
+    chunks.__doc__ = f.__doc__
+    return chunks
+
+def save_chunks(chunks, path):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # Only streams which were read until the end are saved
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                yield chunk
+        os.rename(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
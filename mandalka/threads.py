@@ -20,8 +20,81 @@
 # SOFTWARE.
 
 import threading
+import collections
 
-from .node import touch
+from .node import touch, global_config
+
+class Task:
+    def __init__(self, f, args):
+        self.f = f
+        self.args = args
+        self.started = False
+        self.error = None
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            self.f(*self.args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+class Pool:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.pending = collections.deque()
+        self.workers = 0
+        self.idle = 0
+
+    def submit(self, f, *args):
+        task = Task(f, args)
+        with self.cond:
+            self.pending.append(task)
+            if self.idle > 0:
+                self.cond.notify()
+            elif self.workers < global_config["threads"]:
+                self.workers += 1
+                threading.Thread(
+                    target=self.work,
+                    name="mandalka-worker",
+                    daemon=True,
+                ).start()
+        return task
+
+    def work(self):
+        with self.cond:
+            while self.workers <= global_config["threads"]:
+                if not self.pending:
+                    self.idle += 1
+                    self.cond.wait()
+                    self.idle -= 1
+                    continue
+                task = self.pending.popleft()
+                if task.started:
+                    continue
+                task.started = True
+                self.cond.release()
+                try:
+                    task.run()
+                finally:
+                    self.cond.acquire()
+            self.workers -= 1
+
+    def wait(self, tasks):
+        # Run tasks in this thread if no worker has picked them up yet,
+        # so that nested calls never wait for a free worker
+        for task in tasks:
+            with self.cond:
+                run_here = not task.started
+                task.started = True
+            if run_here:
+                task.run()
+        for task in tasks:
+            task.done.wait()
+        return tasks
+
+pool = Pool()
 
 def threads(*args):
     if len(args) == 1:
@@ -31,10 +104,8 @@ def threads(*args):
         except AttributeError:
             pass
 
-    threads = [
-        threading.Thread(target=touch, args=(o,))
-        for o in args
-    ]
-    [t.start() for t in threads]
-    [t.join() for t in threads]
+    tasks = pool.wait([pool.submit(touch, o) for o in args])
+    for t in tasks:
+        if t.error is not None:
+            raise t.error
     return args
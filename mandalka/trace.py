@@ -0,0 +1,81 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import time
+import json
+import threading
+
+class Trace:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events = []
+
+    def record(self, phase, category, p):
+        # list.append() is atomic, so no locking is needed
+        self.events.append({
+            "name": p.cls.clsname,
+            "cat": category,
+            "ph": phase,
+            "ts": (time.perf_counter() - self.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"nodeid": p.nodeid},
+        })
+
+    def begin(self, category, p):
+        self.record("B", category, p)
+
+    def end(self, category, p):
+        self.record("E", category, p)
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": list(self.events),
+                "displayTimeUnit": "ms",
+            }, f)
+
+    def summary(self):
+        # Inclusive and exclusive time of __init__ for each node, in
+        # seconds (time spent waiting for other threads is not counted
+        # as exclusive)
+        result = {}
+        stacks = {}
+        for e in sorted(self.events, key=lambda e: e["ts"]):
+            stack = stacks.setdefault((e["pid"], e["tid"]), [])
+            if e["ph"] == "B":
+                stack.append([e, 0.0])
+                continue
+            begin, children = stack.pop()
+            duration = (e["ts"] - begin["ts"]) / 1e6
+            if len(stack) > 0:
+                stack[-1][1] += duration
+            if e["cat"] != "init":
+                continue
+            r = result.setdefault(e["args"]["nodeid"], {
+                "class": e["name"],
+                "inclusive": 0.0,
+                "exclusive": 0.0,
+            })
+            r["inclusive"] += duration
+            r["exclusive"] += duration - children
+        return result
@@ -0,0 +1,261 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import pickle
+import threading
+import collections
+import multiprocessing
+import multiprocessing.connection
+
+from .node import (
+    params,
+    touch,
+    state_lock,
+    is_node,
+    initialize,
+    is_initialized,
+    NEW,
+    FAILED,
+)
+from .graph import dump_graph, load_graph
+from .store import dump_buffers, unpickle_state
+
+def serve(connection, *, authkey=None, heartbeat=1.0):
+    # Accept coordinators one by one, if given an address
+    if not hasattr(connection, "recv"):
+        with multiprocessing.connection.Listener(connection,
+                authkey=authkey) as listener:
+            while True:
+                with listener.accept() as conn:
+                    serve(conn, heartbeat=heartbeat)
+
+    send_lock = threading.Lock()
+    stopped = threading.Event()
+
+    def send(message):
+        with send_lock:
+            connection.send(message)
+
+    def send_heartbeats():
+        try:
+            while not stopped.wait(heartbeat):
+                send(("alive",))
+        except (OSError, EOFError):
+            pass
+
+    threading.Thread(target=send_heartbeats, daemon=True).start()
+    try:
+        while True:
+            try:
+                message = connection.recv()
+            except (OSError, EOFError):
+                return
+            if message[0] == "stop":
+                return
+            _, task_id, graph = message
+            nodes = load_graph(dict(graph,
+                roots=list(range(len(graph["nodes"])))))
+            buffers = []
+            try:
+                node = touch(nodes[graph["roots"]])
+                try:
+                    data, buffers = dump_buffers(
+                        object.__getattribute__(node, "__dict__"))
+                    result = ("done", task_id, data,
+                        [b.nbytes for b in buffers])
+                except Exception:
+                    # The coordinator will run __init__ itself
+                    result = ("local", task_id, None)
+            except BaseException as e:
+                try:
+                    error = pickle.dumps(e, pickle.HIGHEST_PROTOCOL)
+                except Exception:
+                    error = pickle.dumps(RuntimeError(repr(e)))
+                result = ("failed", task_id, error)
+                # Let the coordinator retry failed nodes here too
+                for n in nodes:
+                    p = params.get(n)
+                    with state_lock(p):
+                        if p.state == FAILED:
+                            p.state = NEW
+                            p.error = None
+            with send_lock:
+                connection.send(result)
+                # Large buffers are sent without copying them
+                for b in buffers:
+                    connection.send_bytes(b)
+    finally:
+        stopped.set()
+
+class Workers:
+    def __init__(self, connections=(), *, local=0, heartbeat=1.0,
+            timeout=10.0, retries=2):
+        self.heartbeat = heartbeat
+        self.timeout = timeout
+        self.retries = retries
+        self.connections = list(connections)
+        self.processes = []
+
+        # Worker processes on this machine, connected with pipes
+        ctx = multiprocessing.get_context("fork")
+        for _ in range(local):
+            parent_end, child_end = ctx.Pipe()
+            p = ctx.Process(target=serve, args=(child_end,),
+                kwargs={"heartbeat": heartbeat}, daemon=True)
+            p.start()
+            child_end.close()
+            self.connections.append(parent_end)
+            self.processes.append(p)
+
+    def evaluate(self, *args):
+        # Don't look up attributes of nodes, it would evaluate them here
+        if len(args) == 1 and not is_node(args[0]):
+            try:
+                args[0].__iter__
+                args = args[0]
+            except AttributeError:
+                pass
+
+        todo = collections.deque(
+            (i, o) for i, o in enumerate(args) if not is_initialized(o)
+        )
+        # Nodes whose state can't be transferred are evaluated here
+        local = []
+        attempts = collections.Counter()
+        busy = {}
+        last_seen = {c: time.monotonic() for c in self.connections}
+        errors = {}
+
+        def drop(conn):
+            # Tasks of lost workers are tried again elsewhere
+            self.connections.remove(conn)
+            del last_seen[conn]
+            if conn in busy:
+                task_id = busy.pop(conn)
+                attempts[task_id] += 1
+                if attempts[task_id] > self.retries:
+                    errors[task_id] = RuntimeError("Worker lost while "
+                        "evaluating " + str(args[task_id]))
+                else:
+                    todo.appendleft((task_id, args[task_id]))
+            conn.close()
+
+        while len(todo) > 0 or len(busy) > 0:
+            for conn in self.connections:
+                if len(todo) > 0 and conn not in busy:
+                    task_id, node = todo.popleft()
+                    try:
+                        graph = dump_graph(node)
+                    except ValueError:
+                        local.append(task_id)
+                        continue
+                    try:
+                        conn.send(("eval", task_id, graph))
+                        busy[conn] = task_id
+                    except (OSError, EOFError):
+                        todo.appendleft((task_id, node))
+                        drop(conn)
+                        break
+            if len(self.connections) < 1:
+                raise RuntimeError("No workers available")
+
+            ready = multiprocessing.connection.wait(self.connections,
+                timeout=self.heartbeat)
+            now = time.monotonic()
+            for conn in ready:
+                try:
+                    message = conn.recv()
+                except (OSError, EOFError):
+                    drop(conn)
+                    continue
+                last_seen[conn] = now
+                if message[0] == "alive":
+                    continue
+                status, task_id, data = message[0:3]
+                del busy[conn]
+                if status == "local":
+                    local.append(task_id)
+                    continue
+                try:
+                    if status == "done":
+                        buffers = [bytearray(size) for size in message[3]]
+                        for b in buffers:
+                            conn.recv_bytes_into(b)
+                        value = unpickle_state(data, buffers=buffers)
+                    else:
+                        value = pickle.loads(data)
+                except (OSError, EOFError):
+                    busy[conn] = task_id
+                    drop(conn)
+                    continue
+                except Exception as e:
+                    if status == "done":
+                        local.append(task_id)
+                        continue
+                    value = e
+                if status == "done":
+                    def install(node, p):
+                        object.__getattribute__(node, "__dict__") \
+                            .update(value)
+                    initialize(args[task_id], install)
+                    continue
+                # Failed nodes are not marked as failed here
+                attempts[task_id] += 1
+                if attempts[task_id] > self.retries:
+                    errors[task_id] = value
+                else:
+                    todo.append((task_id, args[task_id]))
+
+            for conn in list(self.connections):
+                if now - last_seen[conn] > self.timeout:
+                    drop(conn)
+
+        for task_id in local:
+            try:
+                touch(args[task_id])
+            except BaseException as e:
+                errors[task_id] = e
+
+        if len(errors) > 0:
+            raise errors[min(errors)]
+        return args
+
+    def close(self):
+        for conn in self.connections:
+            try:
+                conn.send(("stop",))
+            except (OSError, EOFError):
+                pass
+            conn.close()
+        self.connections = []
+        for p in self.processes:
+            p.join(self.heartbeat)
+            if p.is_alive():
+                p.kill()
+                p.join()
+        self.processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,57 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mandalka
+
+def error(f):
+    try:
+        f()
+    except TypeError as e:
+        return str(e)
+
+@mandalka.node
+class Node:
+    def __init__(self, a, b=2):
+        pass
+
+@mandalka.node
+class VarNode:
+    def __init__(self, a, *b, c, **d):
+        pass
+
+@mandalka.node
+class OnlyNode:
+    def __init__(self, *, a):
+        pass
+
+print(error(lambda: Node()))
+print(error(lambda: Node(1, 2, 3)))
+print(error(lambda: Node(1, a=1)))
+print(error(lambda: Node(1, c=1)))
+print(error(lambda: VarNode(1)))
+print(error(lambda: VarNode(1, 2, a=1, c=3)))
+print(error(lambda: OnlyNode(1)))
+print(error(lambda: OnlyNode(b=1)))
+
+assert VarNode(1, 2, c=3, e=4) == VarNode(1, 2, e=4, c=3)
+assert mandalka.describe(VarNode(1, 2, c=3, e=4)) == "VarNode(1, 2, c=3, e=4)"
+assert mandalka.describe(Node(b=5, a=1)) == "Node(a=1, b=5)"
+assert mandalka.describe(OnlyNode(a=1)) == "OnlyNode(a=1)"
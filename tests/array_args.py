@@ -0,0 +1,96 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import mandalka
+
+@mandalka.node
+class Mean:
+    def __init__(self, data, axis=None):
+        self.data = data
+        self.value = data.mean(axis=axis)
+
+@mandalka.node
+class Bytes:
+    def __init__(self, data):
+        self.data = bytes(data)
+
+a = np.arange(12.0).reshape(3, 4)
+
+# Arrays are compared by contents, type and shape
+assert Mean(a) is Mean(np.arange(12.0).reshape(3, 4))
+assert Mean(a) is not Mean(a.astype(np.float32))
+assert Mean(a) is not Mean(a.reshape(4, 3))
+assert Mean(a) is not Mean(a.T)
+assert Mean(a[:, 1]) is Mean(np.array([1.0, 5.0, 9.0]))
+assert mandalka.describe(Mean(a)).startswith("Mean(axis=None, data=ndarray(")
+
+# Arguments are copied unless they are read-only already
+x = Mean(a, axis=0).data
+assert not x.flags.writeable
+a[0, 0] = 100.0
+assert Mean(a) is not Mean(np.arange(12.0).reshape(3, 4))
+assert Mean(np.arange(12.0).reshape(3, 4)).value == 5.5
+c = np.ones(5)
+c.flags.writeable = False
+assert Mean(c).data is c
+
+# Other objects with the buffer protocol are passed as bytes,
+# or as read-only arrays
+b = Bytes(bytearray(b"\x01\x02\x03"))
+assert b is Bytes(memoryview(b"\x01\x02\x03"))
+assert b is Bytes(b"\x01\x02\x03")
+assert b.data == b"\x01\x02\x03"
+assert type(mandalka.arguments(b)["data"]) is bytes
+
+import array
+d = array.array("d", [1.0, 2.0, 3.0])
+assert Mean(d) is Mean(np.array([1.0, 2.0, 3.0]))
+assert Mean(d).value == 2.0
+assert not Mean(d).data.flags.writeable
+
+# Arguments of nodes can be sent to other processes
+import pickle
+data = pickle.loads(pickle.dumps(mandalka.dump_graph([b, Mean(d)])))
+assert mandalka.load_graph(data) == [b, Mean(d)]
+
+# NumPy scalars are not buffers
+try:
+    Mean(np.int64(3))
+    assert False
+except ValueError:
+    pass
+
+try:
+    Mean(np.array([None, 1]))
+    assert False
+except ValueError:
+    pass
+
+# Read-only views of writable arrays are copied
+base = np.zeros(10)
+view = base[:]
+view.flags.writeable = False
+m = Mean(view)
+assert m.data is not view
+base[:] = 1.0
+assert Mean(view) is not m
+assert m.value == 0.0
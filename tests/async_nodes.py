@@ -0,0 +1,96 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import asyncio
+import mandalka
+
+@mandalka.node
+class Shard:
+    runs = 0
+
+    async def __init__(self, i):
+        Shard.runs += 1
+        await asyncio.sleep(0.05)
+        self.records = [i] * 3
+        self.count = len(self.records)
+
+@mandalka.node
+class Merge:
+    def __init__(self, *shards):
+        self.records = sum((s.records for s in shards), [])
+
+@mandalka.node
+class Broken:
+    async def __init__(self):
+        await asyncio.sleep(0.01)
+        raise KeyError("broken")
+
+async def main():
+    # Concurrent awaits of the same node share one evaluation
+    a, b, c = await asyncio.gather(*[mandalka.aevaluate(Shard(0))
+        for _ in range(3)])
+    assert a is b is c is Shard(0)
+    assert Shard.runs == 1
+
+    # Nodes are evaluated concurrently
+    start = time.perf_counter()
+    shards = await mandalka.agather([Shard(i) for i in range(1, 11)])
+    assert time.perf_counter() - start < 0.4
+    assert Shard.runs == 11
+    assert shards[3].records == [4, 4, 4]
+
+    # Synchronous access would block the event loop
+    try:
+        Shard(20).records
+        assert False
+    except RuntimeError:
+        pass
+    assert (await mandalka.aevaluate(Shard(20))).records == [20, 20, 20]
+
+    # Other coroutines can't see a node while its __init__ is running
+    task = asyncio.ensure_future(mandalka.aevaluate(Shard(21)))
+    await asyncio.sleep(0.01)
+    try:
+        Shard(21).records
+        assert False
+    except RuntimeError:
+        pass
+    assert (await task).count == 3
+
+    assert (await mandalka.agather(Shard(22)))[0].records == [22, 22, 22]
+
+    # Synchronous nodes are evaluated in a thread
+    merged = await mandalka.aevaluate(Merge(Shard(1), Shard(2)))
+    assert merged.records == [1, 1, 1, 2, 2, 2]
+
+    for _ in range(2):
+        try:
+            await mandalka.aevaluate(Broken())
+            assert False
+        except (KeyError, RuntimeError):
+            pass
+
+asyncio.run(main())
+
+# Outside of an event loop, async nodes can be used like any other
+assert Merge(Shard(30), Shard(31)).records == [30, 30, 30, 31, 31, 31]
+assert len(mandalka.threads(Shard(40), Shard(41))) == 2
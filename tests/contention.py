@@ -0,0 +1,57 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import mandalka
+
+@mandalka.node
+class Slow:
+    runs = 0
+
+    def __init__(self, fail):
+        Slow.runs += 1
+        time.sleep(0.1)
+        if fail:
+            raise KeyError("fail")
+        self.x = 1
+
+results = []
+
+def access(node):
+    try:
+        results.append(node.x)
+    except KeyError:
+        results.append("KeyError")
+    except RuntimeError:
+        results.append("RuntimeError")
+
+for fail in (False, True):
+    threads = [
+        threading.Thread(target=access, args=(Slow(fail),))
+        for _ in range(4)
+    ]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+
+assert Slow.runs == 2
+assert results[:4] == [1, 1, 1, 1]
+assert sorted(results[4:]) == ["KeyError"] + ["RuntimeError"] * 3
@@ -0,0 +1,60 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mandalka
+
+mandalka.config(recursive=False)
+
+@mandalka.node
+class S:
+    def __init__(self, prev):
+        self.n = 0 if prev is None else prev.n + 1
+
+@mandalka.node
+class Add:
+    def __init__(self, a, b):
+        self.n = a.n + b.n
+
+@mandalka.node
+class Broken:
+    def __init__(self):
+        raise KeyError("broken")
+
+# Much deeper than the recursion limit
+s = None
+for _ in range(20000):
+    s = S(s)
+assert s.n == 19999
+assert mandalka.describe(s, -1) == "S(prev=" * 20000 + "None" + ")" * 20000
+assert mandalka.describe(s, 2).startswith("S(prev=S(prev=<S ")
+
+# Shared inputs are evaluated once
+x = S(None)
+for _ in range(1000):
+    x = Add(x, x)
+assert x.n == 0
+
+for _ in range(2):
+    try:
+        S(S(Broken())).n
+        assert False
+    except (KeyError, RuntimeError):
+        pass
@@ -0,0 +1,80 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import sys
+import pickle
+import functools
+import subprocess
+import mandalka
+
+@mandalka.node
+class Pascal:
+    def __init__(self, n, k, *, above=()):
+        self.n = 1 if len(above) == 0 else sum(a.n for a in above)
+
+@mandalka.node
+class Sum:
+    def __init__(self, parts, weights={}):
+        self.n = sum(p.n * weights.get(p, 1) for p in parts)
+
+@functools.lru_cache(None)
+def pascal(n, k):
+    if k <= 0 or k >= n:
+        return Pascal(n, k)
+    return Pascal(n, k, above=(pascal(n-1, k-1), pascal(n-1, k)))
+
+if len(sys.argv) > 1:
+    # Recreate the graph in another process
+    root = mandalka.load_graph(pickle.load(sys.stdin.buffer))
+    print(mandalka.unique_id(root), root.n)
+    sys.exit(0)
+
+root = Sum([pascal(16, 5), pascal(16, 6)], {pascal(16, 6): 2})
+data = mandalka.dump_graph(root)
+
+# Every node is listed once
+assert len(data["nodes"]) == 1 + pascal.cache_info().currsize
+assert len(mandalka.describe(root, -1)) > 50 * len(repr(data))
+assert mandalka.load_graph(data) is root
+assert mandalka.load_graph(mandalka.dump_graph([root, Pascal(1, 1)])) \
+    == [root, Pascal(1, 1)]
+
+out = subprocess.run([sys.executable, sys.argv[0], "load"],
+    input=pickle.dumps(data), stdout=subprocess.PIPE, check=True).stdout
+assert out.decode().split() == [mandalka.unique_id(root), str(root.n)]
+assert root.n == 4368 + 2 * 8008
+
+# Node ids are verified while loading
+cls_name, nodeid, args, kwargs = data["nodes"][0]
+for broken in [(cls_name, nodeid, args, {"n": 1, "k": 2}),
+        ("Missing", nodeid, args, kwargs)]:
+    try:
+        mandalka.load_graph({"nodes": [broken], "roots": 0})
+        assert False
+    except ValueError:
+        pass
+
+mandalka.evaluate(root)
+try:
+    mandalka.dump_graph(root)
+    assert False
+except ValueError:
+    pass
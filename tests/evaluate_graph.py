@@ -0,0 +1,82 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import mandalka
+
+@mandalka.node
+class Leaf:
+    running = 0
+    max_running = 0
+    lock = threading.Lock()
+
+    def __init__(self, i):
+        with Leaf.lock:
+            Leaf.running += 1
+            Leaf.max_running = max(Leaf.max_running, Leaf.running)
+        time.sleep(0.01)
+        with Leaf.lock:
+            Leaf.running -= 1
+        self.x = i
+
+@mandalka.node
+class Sum:
+    order = []
+
+    def __init__(self, *parts):
+        assert all(mandalka.is_node(p) for p in parts)
+        Sum.order.append(self)
+        self.x = sum(p.x for p in parts)
+
+leaves = [Leaf(i) for i in range(20)]
+total = Sum(Sum(*leaves[:10]), Sum(*leaves[10:]), leaves[0])
+
+assert mandalka.evaluate_graph(total, workers=4) == [total]
+assert 1 < Leaf.max_running <= 4
+assert Sum.order[-1] is total
+assert total.x == 190
+
+@mandalka.node
+class Fails:
+    def __init__(self):
+        raise KeyError("fails")
+
+def chain(n):
+    node = Fails()
+    for i in range(n):
+        node = Sum(node)
+    return node
+
+try:
+    mandalka.evaluate_graph([chain(5), Leaf(100)], workers=2)
+    assert False
+except KeyError:
+    pass
+assert len(Sum.order) == 3
+assert Leaf(100).x == 100
+
+Sum.order = []
+deep = Leaf(0)
+for i in range(5000):
+    deep = Sum(deep)
+mandalka.evaluate_graph([deep], workers=1)
+assert len(Sum.order) == 5000
@@ -0,0 +1,78 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mandalka
+
+@mandalka.node
+class Node:
+    def __init__(self, x):
+        self.x = x
+
+    def __len__(self):
+        return self.x
+
+    def get(self):
+        return self.x
+
+    @mandalka.lazy
+    def lazy_get(self):
+        return self.x
+
+n = Node(3)
+assert n.lazy_get() == 3
+assert n.get() == 3
+assert len(n) == 3
+
+assert n.__class__ == Node
+assert isinstance(n, Node)
+assert n.__class__.__name__ == "Node"
+assert type(n)(3) is n
+assert Node(3) is n
+assert str(n) == "<Node " + mandalka.unique_id(n) + ">"
+
+n.y = 4
+assert Node(3).y == 4
+assert sorted(n.__dict__) == ["x", "y"]
+
+# Attributes added to the class later are visible in evaluated nodes
+Node.extra = "patched"
+assert n.extra == "patched"
+assert isinstance(n, Node) and issubclass(type(n), Node)
+
+# Classes with __slots__
+@mandalka.node
+class Slots:
+    __slots__ = ("a",)
+
+    def __init__(self, a):
+        self.a = a
+
+@mandalka.node
+class SlotsDict:
+    __slots__ = ("a", "__dict__", "__weakref__")
+
+    def __init__(self, a):
+        self.a = a
+        self.b = a + 1
+
+assert Slots(1).a == 1
+assert SlotsDict(1).a == 1 and SlotsDict(1).b == 2
+assert type(SlotsDict(1))(1) is SlotsDict(1)
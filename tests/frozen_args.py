@@ -0,0 +1,72 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pickle
+import mandalka
+
+def fails(f):
+    try:
+        f()
+        return False
+    except TypeError:
+        return True
+
+@mandalka.node
+class Copied:
+    def __init__(self, values, options):
+        values.append(4)
+        options["b"] = 2
+        self.values = values
+        self.options = options
+
+@mandalka.node(copy_args=False)
+class Shared:
+    def __init__(self, values, options):
+        assert fails(lambda: values.append(4))
+        assert fails(lambda: options.update(b=2))
+        self.values = values
+        self.options = options
+
+values = [1, 2, [3]]
+options = {"a": {1, 2}}
+
+c = Copied(values, options)
+assert c.values == [1, 2, [3], 4]
+assert c.options == {"a": {1, 2}, "b": 2}
+assert mandalka.arguments(c)["values"] == [1, 2, [3]]
+
+s = Shared(values, options)
+assert s.values == [1, 2, [3]]
+assert s.options == {"a": {1, 2}}
+assert fails(lambda: s.values[2].append(4))
+
+# Frozen arguments are shared between nodes instead of copied
+assert Shared(s.values, s.options).values is s.values
+assert Shared(s.values, s.options) is s
+
+args = mandalka.arguments(s)
+assert fails(lambda: args["values"].pop())
+assert fails(lambda: args["options"].clear())
+assert mandalka.describe(s) == "Shared(options={'a': set(1, 2)}, values=[1, 2, [3]])"
+
+copy = pickle.loads(pickle.dumps(s.options))
+assert copy == s.options
+assert fails(lambda: copy.setdefault("c", 3))
@@ -0,0 +1,55 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import mandalka
+
+@mandalka.node(gc=True)
+class Node:
+    def __init__(self, *args, **kwargs):
+        pass
+
+big = list(range(100000))
+a = Node(big, {"x": big, 1: (big,)}, y=set(range(1000)))
+a_id = mandalka.unique_id(a)
+assert a_id == "e2b9f478a7a2666f"
+assert mandalka.unique_id(Node()) == "cea8705de4a0f55a"
+
+# Nodes must not be created twice, with different ids
+try:
+    mandalka.config(hash="blake2b")
+    assert False
+except ValueError:
+    pass
+mandalka.config(hash="sha256")
+assert Node(big, {"x": big, 1: (big,)}, y=set(range(1000))) is a
+
+del a
+mandalka.config(hash="blake2b")
+b = Node(big, {"x": big, 1: (big,)}, y=set(range(1000)))
+assert b is Node(list(big), {1: (list(big),), "x": big}, y=set(range(1000)))
+assert len(mandalka.unique_id(b)) == 16
+assert mandalka.unique_id(b) != a_id
+
+try:
+    mandalka.config(hash="md5")
+    assert False
+except ValueError:
+    pass
@@ -0,0 +1,68 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gc
+import mandalka
+
+cache = mandalka.LRU(max_count=2)
+
+@mandalka.node(cache=cache)
+class Data:
+    def __init__(self, i):
+        print("Computing %d" % i)
+        self.values = list(range(1000))
+
+for i in range(3):
+    Data(i).values
+gc.collect()
+print(cache.stats()["evictions"], cache.stats()["count"])
+
+# Nodes 1 and 2 are still cached
+Data(1)
+Data(2).values
+
+# Node 0 was evicted and needs to be computed again
+Data(0).values
+gc.collect()
+
+# Using node 2 made node 1 the least recently used one
+Data(2).values
+Data(1).values
+
+sizes = cache.sizes()
+assert len(sizes) == 2
+assert all(size > 8000 for node, size in sizes)
+
+big = mandalka.LRU(max_bytes=100000)
+
+@mandalka.node(cache=big)
+class Big:
+    def __init__(self, i):
+        self.data = bytes(30000)
+        self.other = Data(1)
+
+kept = Big(0)
+for i in range(10):
+    Big(i).data
+stats = big.stats()
+assert stats["count"] == 3
+assert stats["evictions"] == 7
+assert 90000 < stats["bytes"] <= 100000
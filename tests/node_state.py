@@ -0,0 +1,117 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import numpy as np
+import mandalka
+
+@mandalka.node
+class Data:
+    runs = 0
+
+    def __init__(self, size):
+        Data.runs += 1
+        self.values = np.arange(size)
+
+# Attributes of nodes may refer to other nodes
+@mandalka.node(store=True)
+class Model:
+    runs = 0
+
+    def __init__(self, data):
+        Model.runs += 1
+        self.data = data
+        self.parts = {"first": data, "all": [data, Data(1)]}
+        self.total = int(data.values.sum())
+
+m = Model(Data(5))
+assert m.total == 10
+assert m.data is Data(5)
+assert Model.runs == 1
+
+# Stored nodes are loaded as references to the same nodes
+from mandalka.store import Store
+state = Store().load(mandalka.unique_id(m))
+assert state["data"] is Data(5)
+assert state["parts"]["all"][1] is Data(1)
+assert state["total"] == 10
+
+spill = mandalka.Spill(max_bytes=1)
+
+@mandalka.node(spill=spill)
+class Holder:
+    def __init__(self, i):
+        self.input = Data(i)
+        self.big = bytes(1000)
+
+holders = [Holder(i) for i in range(3)]
+[mandalka.touch(h) for h in holders]
+assert spill.stats()["spills"] == 2
+assert holders[0].input is Data(0)
+assert spill.stats()["reloads"] == 1
+
+@mandalka.node
+class Pair:
+    def __init__(self, data):
+        self.data = data
+        self.values = data.values * 2
+
+with mandalka.Workers(local=1) as workers:
+    pairs = workers.evaluate([Pair(Data(3)), Pair(Data(4))])
+assert pairs[1].data is Data(4)
+assert list(pairs[1].values) == [0, 2, 4, 6]
+
+# Nodes passed to evaluate() are referred to by their ids
+@mandalka.node
+class User:
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data.values)
+
+d = Data(7)
+mandalka.evaluate(d)
+assert mandalka.processes([User(d)])[0].data is d
+with mandalka.Workers(local=1) as workers:
+    assert workers.evaluate([User(Data(8))])[0].size == 8
+
+# State which can't be transferred is computed in this process
+import threading
+
+@mandalka.node
+class Locked:
+    def __init__(self, i):
+        self.lock = threading.Lock()
+        self.i = i
+
+assert mandalka.processes([Locked(1)])[0].i == 1
+with mandalka.Workers(local=1) as workers:
+    assert workers.evaluate([Locked(2)])[0].i == 2
+    e = Data(9)
+    mandalka.evaluate(e)
+    assert workers.evaluate([User(e)])[0].data is e
+
+@mandalka.node(store=True)
+class StoredUser:
+    def __init__(self, data):
+        self.data = data
+
+assert StoredUser(e).data is e
+assert Store().load(mandalka.unique_id(StoredUser(e)))["data"] is e
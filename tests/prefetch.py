@@ -0,0 +1,90 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import threading
+import mandalka
+
+mandalka.config(lazy="prefetch", threads=8)
+
+@mandalka.node
+class Slow:
+    lock = threading.Lock()
+    runs = 0
+
+    def __init__(self, i):
+        with Slow.lock:
+            Slow.runs += 1
+        time.sleep(0.2)
+        self.i = i
+
+@mandalka.node
+class Total:
+    def __init__(self, parts):
+        self.i = sum(p.i for p in parts)
+
+@mandalka.node
+class Broken:
+    def __init__(self, i=0):
+        raise KeyError("broken")
+
+start = time.perf_counter()
+total = Total([Slow(i) for i in range(8)])
+assert time.perf_counter() - start < 0.15
+
+# Nodes are evaluated in the background
+assert total.i == 28
+assert time.perf_counter() - start < 1.0
+assert Slow.runs == 8
+assert Total([Slow(i) for i in range(8)]) is total
+assert Slow.runs == 8
+
+b = Broken()
+for _ in range(2):
+    try:
+        b.x
+        assert False
+    except (KeyError, RuntimeError):
+        pass
+
+# Errors of prefetched nodes are kept
+b = Broken(1)
+time.sleep(0.1)
+try:
+    b.x
+    assert False
+except RuntimeError as e:
+    assert isinstance(e.__cause__, KeyError)
+
+# Each node is submitted only once
+from mandalka.threads import pool
+submitted = []
+submit = pool.submit
+pool.submit = lambda f, *args: submitted.append(args) or submit(f, *args)
+nodes = [Slow(50) for _ in range(10)]
+assert len(submitted) == 1
+assert nodes[9].i == 50
+pool.submit = submit
+
+mandalka.config(lazy=True)
+Slow(100)
+time.sleep(0.3)
+assert Slow.runs == 9
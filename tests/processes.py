@@ -0,0 +1,80 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import mandalka
+
+@mandalka.node
+class Data:
+    def __init__(self, size):
+        self.pid = os.getpid()
+        self.values = list(range(size))
+
+@mandalka.node
+class Sum:
+    def __init__(self, data, power):
+        self.pid = os.getpid()
+        self.total = sum(v ** power for v in data.values)
+
+data = Data(1000)
+data.values
+
+sums = mandalka.processes([Sum(data, p) for p in range(4)])
+assert [s.total for s in sums] == [sum(v ** p for v in range(1000))
+    for p in range(4)]
+assert all(s.pid != os.getpid() for s in sums)
+assert data.pid == os.getpid()
+
+# Nodes which are already evaluated are not sent to other processes
+assert mandalka.processes(Sum(data, 0))[0] is Sum(data, 0)
+
+@mandalka.node
+class Fails:
+    def __init__(self):
+        raise KeyError("fails")
+
+try:
+    mandalka.processes(Fails(), Sum(data, 5))
+    assert False
+except KeyError:
+    pass
+assert Sum(data, 5).pid != os.getpid()
+
+try:
+    Fails().x
+    assert False
+except RuntimeError:
+    pass
+
+# A single node is evaluated in a child process too
+single = mandalka.processes(Sum(data, 6))
+assert single[0].pid != os.getpid()
+
+@mandalka.node
+class Model:
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data.values)
+
+# Nodes in the state of other nodes are sent as references
+models = mandalka.processes(Model(Data(5)), Model(Data(6)))
+assert models[0].data is Data(5)
+assert [m.size for m in models] == [5, 6]
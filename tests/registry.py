@@ -0,0 +1,50 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import sys
+import threading
+import mandalka
+
+sys.setswitchinterval(1e-6)
+
+@mandalka.node
+class Node:
+    def __init__(self, i):
+        pass
+
+@mandalka.node(gc=True)
+class Collected:
+    def __init__(self, i):
+        pass
+
+results = [[] for _ in range(8)]
+
+def construct(t):
+    for i in range(2000):
+        results[t].append(Node(i))
+        results[t].append(Collected(i))
+
+threads = [threading.Thread(target=construct, args=(t,)) for t in range(8)]
+[t.start() for t in threads]
+[t.join() for t in threads]
+
+for r in results[1:]:
+    assert all(a is b for a, b in zip(r, results[0]))
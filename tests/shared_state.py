@@ -0,0 +1,63 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import glob
+import tempfile
+import numpy as np
+import mandalka
+
+@mandalka.node
+class Big:
+    def __init__(self, n):
+        self.pid = os.getpid()
+        self.values = np.arange(n, dtype=np.float64)
+        self.parts = {"small": np.ones(3), "strided": self.values[::2]}
+
+def leftover_files():
+    return glob.glob("/dev/shm/mandalka-*") \
+        + glob.glob(os.path.join(tempfile.gettempdir(), "mandalka-*"))
+
+before = leftover_files()
+
+# Large arrays are passed through files
+data, files = mandalka.store.dump_state({"a": np.zeros(100000)})
+assert len(files) == 1
+state = mandalka.store.load_state(data, files)
+assert not any(os.path.exists(f) for f in files)
+state["a"][0] = 1.0
+assert state["a"].sum() == 1.0
+
+nodes = mandalka.processes([Big(10**6), Big(10)])
+with mandalka.Workers(local=2) as workers:
+    nodes += workers.evaluate(Big(10**6 + 1), Big(11))
+
+for node in nodes:
+    n = len(node.values)
+    assert node.pid != os.getpid()
+    assert node.values.flags.writeable
+    assert node.values[-1] == n - 1
+    assert node.values.sum() == n * (n - 1) / 2
+    assert list(node.parts["strided"][:3]) == [0.0, 2.0, 4.0]
+    assert node.parts["small"].sum() == 3.0
+    node.values[0] = 1.0
+
+assert leftover_files() == before
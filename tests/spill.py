@@ -0,0 +1,103 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import mandalka
+
+spill = mandalka.Spill(max_bytes=250000)
+
+@mandalka.node(spill=spill)
+class Data:
+    runs = 0
+
+    def __init__(self, i):
+        Data.runs += 1
+        self.values = bytes([i]) * 100000
+
+@mandalka.node
+class Total:
+    def __init__(self, parts):
+        self.total = sum(p.values[0] for p in parts)
+
+data = [Data(i) for i in range(10)]
+assert Total(data).total == 45
+
+# Only the most recently used nodes are kept in memory
+stats = spill.stats()
+assert stats["count"] == 2
+assert stats["spills"] == 8
+assert stats["spilled_bytes"] > 800000
+assert stats["reloads"] == 0
+assert len(os.listdir(spill.directory())) == 8
+
+# Spilled nodes are reloaded when needed
+assert data[0].values == bytes([0]) * 100000
+assert Data(5).values[0] == 5
+stats = spill.stats()
+assert stats["reloads"] == 2
+assert stats["spills"] == 10
+assert stats["reloaded_bytes"] > 200000
+assert Data.runs == 10
+
+mandalka.evaluate(data[1])
+assert all(d.values[0] == i for i, d in enumerate(data))
+assert Data.runs == 10
+assert spill.stats()["count"] == 2
+
+# Spilled nodes count as evaluated, and reloads are not inits
+from mandalka.node import is_initialized
+mandalka.config(stats=True)
+def is_spilled(node):
+    return object.__getattribute__(node, "__dict__") == {}
+
+spilled = [d for d in data if is_spilled(d)]
+assert len(spilled) == 8
+assert all(is_initialized(d) for d in spilled)
+assert mandalka.evaluate_graph(spilled) == spilled
+assert mandalka.processes(spilled) == spilled
+assert all(d.values[0] == i for i, d in enumerate(data))
+assert mandalka.stats()["Data"]["inits"] == 0
+assert Data.runs == 10
+
+# Nodes passed to evaluate() can be spilled too
+done = [Data(i) for i in range(10, 13)]
+[mandalka.evaluate(d) for d in done]
+assert is_spilled(done[0])
+assert mandalka.evaluate_graph(done[0]) == [done[0]]
+assert done[0].values[0] == 10
+
+# Nodes which can't be saved are not spilled
+import threading
+
+locked_spill = mandalka.Spill(max_bytes=1)
+
+@mandalka.node(spill=locked_spill)
+class Locked:
+    def __init__(self, i):
+        self.lock = threading.Lock()
+        self.data = i
+
+assert Locked(1).data == 1
+assert Locked(2).data == 2
+assert Locked(1).data == 1
+assert locked_spill.stats()["failed"] == 1
+assert locked_spill.stats()["spills"] == 0
+assert os.listdir(locked_spill.directory()) == []
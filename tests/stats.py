@@ -0,0 +1,63 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+import mandalka
+
+@mandalka.node
+class Fib:
+    def __init__(self, n):
+        if n <= 1:
+            self.n = n
+        else:
+            self.n = Fib(n-1).n + Fib(n-2).n
+
+@mandalka.node
+class Slow:
+    def __init__(self, fail):
+        time.sleep(0.01)
+        if fail:
+            raise KeyError("fail")
+
+Fib(5).n
+assert "Fib" not in mandalka.stats() or mandalka.stats()["Fib"]["inits"] == 0
+
+mandalka.config(stats=True)
+Fib(20).n
+Slow(False).x = 1
+try:
+    Slow(True).x = 1
+except KeyError:
+    pass
+
+s = mandalka.stats(reset=True)
+assert s["Fib"]["inits"] == 15
+assert s["Fib"]["constructions"] == 31
+assert s["Fib"]["hits"] == 16
+assert s["Fib"]["failed"] == 0
+assert s["Slow"]["inits"] == 2
+assert s["Slow"]["failed"] == 1
+assert s["Slow"]["max_init_time"] >= 0.01
+assert s["Slow"]["init_time"] >= 0.02
+assert abs(s["Slow"]["mean_init_time"] * 2 - s["Slow"]["init_time"]) < 1e-9
+assert s["Slow"]["wait_time"] == 0.0
+
+assert mandalka.stats()["Fib"]["constructions"] == 0
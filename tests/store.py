@@ -0,0 +1,58 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import numpy as np
+import mandalka
+
+@mandalka.node(store=True)
+class Data:
+    def __init__(self, size):
+        print("Computing data...")
+        self.squares = np.square(np.arange(size))
+        self.info = {"size": size}
+
+@mandalka.node(store="custom_dir")
+class Model:
+    def __init__(self, data, scale):
+        print("Computing model...")
+        self.weights = data.squares * scale
+
+model = Model(Data(5), 10)
+print(model.weights)
+print(Data(5).info)
+
+assert os.path.isdir(os.path.join(".mandalka", mandalka.unique_id(Data(5))))
+assert os.listdir("custom_dir") == [mandalka.unique_id(model)]
+
+@mandalka.node(store=True)
+class Unpicklable:
+    def __init__(self):
+        self.f = lambda: 1
+
+try:
+    Unpicklable().f
+    assert False
+except Exception:
+    pass
+assert not os.path.exists(
+    os.path.join(".mandalka", mandalka.unique_id(Unpicklable()))
+)
@@ -0,0 +1,52 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+import time
+import subprocess
+import mandalka
+
+@mandalka.node(store=True)
+class Shared:
+    def __init__(self, n):
+        with open("runs.txt", "a") as f:
+            f.write("%d\n" % os.getpid())
+        time.sleep(0.5)
+        self.values = list(range(n))
+
+if len(sys.argv) > 1:
+    print(sum(Shared(1000).values))
+    sys.exit(0)
+
+# Only one process evaluates the node, others wait for the result
+children = [
+    subprocess.Popen([sys.executable, sys.argv[0], "child"],
+        stdout=subprocess.PIPE)
+    for _ in range(4)
+]
+outputs = [c.communicate()[0] for c in children]
+assert all(c.returncode == 0 for c in children)
+assert outputs == [b"499500\n"] * 4
+
+with open("runs.txt") as f:
+    assert len(f.readlines()) == 1
+assert os.listdir(".mandalka") == [mandalka.unique_id(Shared(1000))]
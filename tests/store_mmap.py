@@ -0,0 +1,44 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import mandalka
+
+@mandalka.node(store=mandalka.Store("cache", mmap=True))
+class Big:
+    def __init__(self, size):
+        print("Computing...")
+        self.array = np.arange(size)
+        self.name = "big"
+
+big = Big(1000)
+print(big.array[10:13], big.name)
+
+mandalka.config(cache_dir="cache")
+
+@mandalka.node(store=True)
+class Loaded:
+    def __init__(self):
+        self.array = np.arange(3)
+
+if isinstance(big.array, np.memmap):
+    assert not big.array.flags.writeable
+    assert not isinstance(Loaded().array, np.memmap)
@@ -0,0 +1,56 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import mandalka
+
+@mandalka.node
+class Records:
+    def __init__(self, n):
+        print("Preparing records...")
+        self.n = n
+
+    @mandalka.stream(spool=True)
+    def chunks(self):
+        print("Generating chunks...")
+        for i in range(0, self.n, 4):
+            yield list(range(i, min(i + 4, self.n)))
+
+    @mandalka.stream
+    def squares(self, limit):
+        for chunk in self.chunks():
+            yield [v * v for v in chunk if v < limit]
+
+@mandalka.node
+class Total:
+    def __init__(self, records):
+        self.total = sum(sum(c) for c in records.chunks())
+
+# Streams which are not read until the end are not saved
+assert next(Records(6).chunks()) == [0, 1, 2, 3]
+
+records = Records(10)
+print(Total(records).total)
+print(list(records.chunks()))
+print(sum(records.squares(5), []))
+assert os.listdir(".mandalka") == [
+    mandalka.unique_id(records) + ".chunks.stream"
+]
@@ -0,0 +1,62 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import mandalka
+
+mandalka.config(threads=2)
+
+@mandalka.node
+class Square:
+    names = set()
+
+    def __init__(self, x):
+        Square.names.add(threading.current_thread().name)
+        self.x = x * x
+
+squares = mandalka.threads([Square(i) for i in range(1000)])
+assert [s.x for s in squares] == [i * i for i in range(1000)]
+assert len(Square.names) <= 3
+
+@mandalka.node
+class Sum:
+    def __init__(self, start, end):
+        if end - start <= 1:
+            self.x = start
+        else:
+            half = (start + end) // 2
+            a, b = mandalka.threads(Sum(start, half), Sum(half, end))
+            self.x = a.x + b.x
+
+mandalka.config(threads=1)
+assert Sum(0, 100).x == 4950
+
+@mandalka.node
+class Fails:
+    def __init__(self):
+        raise KeyError("fails")
+
+try:
+    mandalka.threads(Square(-1), Fails())
+    assert False
+except KeyError:
+    pass
+assert Square(-1).x == 1
@@ -0,0 +1,62 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import time
+import mandalka
+
+@mandalka.node
+class Leaf:
+    def __init__(self, i):
+        time.sleep(0.02)
+
+@mandalka.node
+class Sum:
+    def __init__(self, *parts):
+        [mandalka.touch(p) for p in parts]
+        time.sleep(0.01)
+
+trace = mandalka.Trace()
+mandalka.config(trace=trace)
+root = Sum(Leaf(0), Leaf(1), Leaf(2))
+root.x = 1
+mandalka.threads(Leaf(4), Leaf(5))
+mandalka.config(trace=False)
+Leaf(3).x = 1
+
+assert len(trace.events) == 12
+assert sorted(e["name"] for e in trace.events if e["ph"] == "B") \
+    == ["Leaf"] * 5 + ["Sum"]
+assert all(e["ph"] in "BE" and e["tid"] > 0 for e in trace.events)
+
+summary = trace.summary()
+assert len(summary) == 6
+r = summary[mandalka.unique_id(root)]
+assert r["class"] == "Sum"
+assert r["inclusive"] >= 0.03
+assert 0.01 <= r["exclusive"] < r["inclusive"]
+for i in range(3):
+    r = summary[mandalka.unique_id(Leaf(i))]
+    assert r["inclusive"] == r["exclusive"] >= 0.02
+
+trace.save("trace.json")
+with open("trace.json") as f:
+    assert len(json.load(f)["traceEvents"]) == 12
@@ -0,0 +1,71 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import mandalka
+
+def node_id(description):
+    return hashlib.sha256(bytes(description, "UTF-8")).hexdigest()[0:16]
+
+@mandalka.node
+class Data:
+    def __init__(self, n):
+        self.n = n
+
+@mandalka.node(version=2)
+class Versioned:
+    def __init__(self, n):
+        self.n = n
+
+@mandalka.node(version=True)
+class Auto:
+    def __init__(self, n):
+        self.n = n
+
+@mandalka.node
+class Model:
+    def __init__(self, data):
+        self.n = data.n
+
+# Ids of classes without a version don't change
+assert mandalka.unique_id(Data(5)) == node_id("mandalka:'Data'|n=5")
+assert mandalka.unique_id(Versioned(5)) \
+    == node_id("mandalka:'Versioned'@2|n=5")
+assert mandalka.unique_id(Auto(5)) != node_id("mandalka:'Auto'|n=5")
+
+# Versions are propagated to all nodes which depend on a class
+assert mandalka.unique_id(Model(Versioned(5))) == node_id(
+    "mandalka:'Model'|data=<Versioned %s>" % mandalka.unique_id(Versioned(5))
+)
+assert mandalka.describe(Model(Auto(5)), -1) == "Model(data=Auto(n=5))"
+assert Model(Auto(5)).n == 5
+
+try:
+    mandalka.node(version=[object()])(type("Dynamic", (), {}))
+    assert False
+except ValueError:
+    pass
+
+try:
+    mandalka.node(version=True)(type("Dynamic", (), {}))
+    assert False
+except ValueError:
+    pass
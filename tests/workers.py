@@ -0,0 +1,106 @@
+
+# Copyright (c) 2017 SquirrelInHell
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import signal
+import multiprocessing
+import multiprocessing.connection
+import mandalka
+
+@mandalka.node
+class Data:
+    def __init__(self, size):
+        self.pid = os.getpid()
+        self.values = list(range(size))
+
+@mandalka.node
+class Sum:
+    def __init__(self, data, power):
+        self.pid = os.getpid()
+        self.total = sum(v ** power for v in data.values)
+
+def first_attempt(name):
+    try:
+        os.close(os.open(name, os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        return False
+
+@mandalka.node
+class Flaky:
+    def __init__(self, how):
+        if first_attempt(how):
+            if how == "raise":
+                raise KeyError("flaky")
+            if how == "exit":
+                os._exit(1)
+            if how == "stop":
+                os.kill(os.getpid(), signal.SIGSTOP)
+        self.pid = os.getpid()
+
+@mandalka.node
+class Fails:
+    def __init__(self):
+        raise KeyError("fails")
+
+with mandalka.Workers(local=3, heartbeat=0.1, timeout=1.0) as workers:
+    sums = workers.evaluate([Sum(Data(1000), p) for p in range(4)])
+    assert [s.total for s in sums] == [sum(v ** p for v in range(1000))
+        for p in range(4)]
+    assert all(s.pid != os.getpid() for s in sums)
+
+    assert workers.evaluate(Sum(Data(1000), 0))[0] is Sum(Data(1000), 0)
+    assert workers.evaluate(Sum(Data(1000), 5))[0].pid != os.getpid()
+
+    # Nodes are retried after errors, lost workers and missed heartbeats
+    flaky = workers.evaluate(Flaky("raise"), Flaky("exit"), Flaky("stop"))
+    assert all(f.pid != os.getpid() for f in flaky)
+    assert len(workers.connections) == 1
+
+    # Failures in workers don't mark nodes as failed in this process
+    try:
+        workers.evaluate(Fails())
+        assert False
+    except KeyError:
+        pass
+    try:
+        Fails().x
+        assert False
+    except KeyError:
+        pass
+
+# Workers can also listen on a socket
+address = ("localhost", 47000 + os.getpid() % 10000)
+ctx = multiprocessing.get_context("fork")
+server = ctx.Process(target=mandalka.serve, args=(address,),
+    kwargs={"authkey": b"secret"}, daemon=True)
+server.start()
+for _ in range(100):
+    try:
+        conn = multiprocessing.connection.Client(address, authkey=b"secret")
+        break
+    except ConnectionRefusedError:
+        server.join(0.05)
+with mandalka.Workers([conn]) as workers:
+    s = workers.evaluate(Sum(Data(10), 2))[0]
+    assert s.total == 285
+    assert s.pid == server.pid
+server.kill()